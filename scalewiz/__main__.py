@@ -1,12 +1,37 @@
 """The entry point for the program."""
 
+import sys
 import tkinter as tk
 
-from scalewiz.components.scalewiz import ScaleWiz
-
 
 def main() -> None:
-    """The Tkinter entry point of the program; enters mainloop."""
+    """The Tkinter entry point of the program; enters mainloop.
+
+    Runs a test without the GUI instead if called as `scalewiz run ...`,
+    benchmarks simulated pumps if called as `scalewiz bench ...`,
+    scores project files if called as `scalewiz score ...`,
+    or converts how a project stores its readings if called as `scalewiz convert ...`.
+    """
+    # keep the GUI stack out of headless runs
+    if len(sys.argv) > 1 and sys.argv[1] == "run":
+        from scalewiz.headless import run
+
+        sys.exit(run(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        from scalewiz.benchmark import run
+
+        sys.exit(run(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "score":
+        from scalewiz.batch import run
+
+        sys.exit(run(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "convert":
+        from scalewiz.convert import run
+
+        sys.exit(run(sys.argv[2:]))
+
+    from scalewiz.components.scalewiz import ScaleWiz
+
     root = tk.Tk()
     ScaleWiz(root).grid()
     root.mainloop()
@@ -0,0 +1,58 @@
+"""Scores project files from the command line, without a GUI."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+
+from scalewiz.headless import init_tcl
+from scalewiz.models.project import Project
+from scalewiz.models.scoring import format_trace, score_project
+
+LOGGER = logging.getLogger("scalewiz")
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    """Parses the arguments for a batch of projects to score."""
+    parser = argparse.ArgumentParser(
+        prog="scalewiz score",
+        description="Score the tests in one or more project files.",
+    )
+    parser.add_argument("projects", nargs="+", help="paths to the projects' files")
+    parser.add_argument(
+        "--log",
+        action="store_true",
+        help="print the full calculation log for each project",
+    )
+    return parser.parse_args(argv)
+
+
+def run(argv: list[str] = None) -> int:
+    """Prints the results for each project. Returns an exit code."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    init_tcl()
+    code = 0
+    for path in args.projects:
+        if not os.path.isfile(path):
+            LOGGER.error("No project file found at %s", path)
+            code = 1
+            continue
+        project = Project()
+        project.load_json(path)
+        scores = score_project(project)
+        print(project.name.get())
+        if args.log:
+            print("\n".join(format_trace(scores.trace)))
+        elif len(scores.trace.blanks) == 0:
+            print("  no blanks to score against")
+        for test, result in zip(project.tests, scores.results):
+            if result is not None:
+                print(f"  {test.name.get()}: {result}")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,93 @@
+"""Benchmarks polling the pumps against simulated pumps, without hardware."""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+from time import monotonic
+
+from py_hplc.pump_error import PumpError
+
+from scalewiz.headless import init_tcl
+from scalewiz.models.scheduler import Scheduler
+from scalewiz.models.simulated_pump import SimulatedPump
+from scalewiz.models.test_handler import TestHandler
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    """Parses the arguments for a benchmark run."""
+    parser = argparse.ArgumentParser(
+        prog="scalewiz bench",
+        description="Time paired pressure readings against simulated pumps.",
+    )
+    parser.add_argument("--readings", type=int, default=100, help="paired reads")
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    return parser.parse_args(argv)
+
+
+def summarize(label: str, durations: list[float], skews: list[float]) -> str:
+    """Returns a line summarizing the passed durations and skews, in seconds."""
+    if len(durations) < 2:
+        return f"{label}: not enough successful reads"
+    p95 = statistics.quantiles(durations, n=20)[-1]
+    return (
+        f"{label}: {len(durations)} reads, "
+        f"mean {statistics.mean(durations) * 1000:.1f} ms, "
+        f"p95 {p95 * 1000:.1f} ms, "
+        f"mean skew {statistics.mean(skews) * 1000:.1f} ms, "
+        f"max skew {max(skews) * 1000:.1f} ms"
+    )
+
+
+def read_sequential(handler: TestHandler) -> float:
+    """Reads pump 1 then pump 2, returning the skew between them in seconds."""
+    start = monotonic()
+    handler.pump1.pressure
+    handler.pump2.pressure
+    # the midpoints of two back-to-back round trips are half the total apart
+    return (monotonic() - start) / 2
+
+
+def read_concurrent(handler: TestHandler) -> float:
+    """Reads both pumps at once, returning the skew between them in seconds."""
+    return handler.read_pressures()[2] / 1000
+
+
+def run(argv: list[str] = None) -> int:
+    """Compares sequential and concurrent polling. Returns an exit code."""
+    args = parse_args(argv)
+    init_tcl()
+    handler = TestHandler(name="Benchmark", scheduler=Scheduler(workers=0))
+    for i in (1, 2):
+        pump = SimulatedPump(
+            f"sim:{i}",
+            handler.logger,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            failure_rate=args.failure_rate,
+        )
+        setattr(handler, f"pump{i}", pump)
+
+    for label, read in (
+        ("sequential", read_sequential),
+        ("concurrent", read_concurrent),
+    ):
+        durations, skews, failures = [], [], 0
+        for _ in range(args.readings):
+            start = monotonic()
+            try:
+                skew = read(handler)
+            except PumpError:
+                failures += 1
+                continue
+            durations.append(monotonic() - start)
+            skews.append(skew)
+        print(summarize(label, durations, skews) + f", {failures} failures")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -6,21 +6,32 @@ import os
 import time
 import tkinter as tk
 import typing
-from tkinter import font, ttk
+from functools import partial
+from tkinter import ttk
 
-import matplotlib as mpl
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
 from matplotlib.ticker import MultipleLocator
 
-from scalewiz.components.test_evaluation_row import TestResultRow
+from scalewiz.components.test_results_table import TestResultsTable
+from scalewiz.helpers.downsample import lttb
 from scalewiz.helpers.export_csv import export_csv
 from scalewiz.helpers.set_icon import set_icon
 from scalewiz.models.project import Project
+from scalewiz.models.repository import open_project, save_project
+from scalewiz.models.scoring import ScoreCache, format_trace, score_project
 
 if typing.TYPE_CHECKING:
+    from matplotlib.lines import Line2D
+
+    from scalewiz.models.test import Test
     from scalewiz.models.test_handler import TestHandler
 
+# wait this long after the last edit before rescoring, so a burst of edits
+# (eg. scrolling through a combobox) gets scored and plotted just once
+SCORE_DELAY_MS = 150
+
 COLORS = [
     "orange",
     "blue",
@@ -43,10 +54,27 @@ class EvaluationWindow(tk.Toplevel):
         self.handler = handler
         self.editor_project = Project()
         if os.path.isfile(self.handler.project.path.get()):
-            self.editor_project.load_json(self.handler.project.path.get())
-        # matplotlib uses these later
-        self.fig, self.axis, self.canvas = None, None, None
-        self.plot_frame = tk.Frame(self)  # this gets destroyed in plot()
+            self.editor_project = open_project(self.handler.project.path.get())
+        # lets us rescore only the tests that changed since the last score
+        self.score_cache = ScoreCache()
+        self.score_job: str = None  # id of the pending score, if any
+        self.score_passes = 0  # how many times we actually scored
+        self.score_skips = 0  # how many scores were folded into a later one
+        # one figure for the life of the window, updated in place by plot()
+        # made without pyplot, so closing pyplot's figures doesn't affect it
+        self.plot_frame = ttk.Frame(self)  # build() keeps this frame around
+        with plt.style.context("bmh"):
+            self.fig = Figure(figsize=(7.5, 4), dpi=100, tight_layout=True)
+            self.fig.patch.set_facecolor("#FAFAFA")
+            self.axis = self.fig.add_subplot()
+            self.axis.set_xlabel("Time (min)")
+            self.axis.set_ylabel("Pressure (psi)")
+            self.axis.yaxis.set_major_locator(MultipleLocator(100))
+            self.axis.margins(0)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.lines: dict[Test, Line2D] = {}  # the plotted line for each test
+        self.log_lines: list[str] = []  # the latest calculations log
         self.build()
 
     def render(self, label: tk.Widget, entry: tk.Widget, row: int) -> None:
@@ -62,8 +90,7 @@ class EvaluationWindow(tk.Toplevel):
             for test in self.editor_project.tests:
                 test.remove_traces()
             self.editor_project.remove_traces()
-            self.editor_project = Project()
-            self.editor_project.load_json(self.handler.project.path.get())
+            self.editor_project = open_project(self.handler.project.path.get())
 
         self.winfo_toplevel().title(
             f"{self.handler.name} {self.handler.project.name.get()}"
@@ -71,72 +98,33 @@ class EvaluationWindow(tk.Toplevel):
         set_icon(self)
 
         for child in self.winfo_children():
-            child.destroy()
+            if child is not self.plot_frame:
+                child.destroy()
 
         self.tab_control = ttk.Notebook(self)
         self.tab_control.grid(row=0, column=0)
-
-        tests_frame = ttk.Frame(self)
-
-        bold_font = font.Font(family="Arial", weight="bold", size=10)
-        # header row
-        labels = []
-        labels.append(tk.Label(tests_frame, text="Name", font=bold_font))
-        labels.append(tk.Label(tests_frame, text="Label", font=bold_font))
-        labels.append(tk.Label(tests_frame, text="Minutes", font=bold_font))
-        labels.append(tk.Label(tests_frame, text="Pump", font=bold_font))
-        labels.append(tk.Label(tests_frame, text="Baseline", font=bold_font))
-        labels.append(tk.Label(tests_frame, text="Max", font=bold_font))
-        labels.append(tk.Label(tests_frame, text="Clarity", font=bold_font))
-        labels.append(tk.Label(tests_frame, text="Notes", font=bold_font))
-        labels.append(tk.Label(tests_frame, text="Result", font=bold_font))
-        labels.append(tk.Label(tests_frame, text="Report", font=bold_font))
-        for i, label in enumerate(labels):
-            label.grid(row=0, column=i, padx=3, sticky="w")
-
         self.grid_columnconfigure(0, weight=1)
 
-        self.blanks = []
-        for test in self.editor_project.tests:
-            if test.is_blank.get():
-                self.blanks.append(test)
-
-        # select the trials
-        self.trials = []
-        for test in self.editor_project.tests:
-            if not test.is_blank.get():
-                self.trials.append(test)
-
-        tk.Label(tests_frame, text="Blanks:", font=bold_font).grid(
-            row=1, column=0, sticky="w", padx=3, pady=1
-        )
-        tk.Label(tests_frame, text="Trials:", font=bold_font).grid(
-            row=2 + len(self.blanks), column=0, sticky="w", padx=3, pady=1
-        )
-
-        for i, blank in enumerate(self.blanks):
-            TestResultRow(tests_frame, blank, self.editor_project, i + 2).grid(
-                row=i + 1, column=0, sticky="w", padx=3, pady=1
-            )
-        count = len(self.blanks)
-        for i, trial in enumerate(self.trials):
-            TestResultRow(tests_frame, trial, self.editor_project, i + count + 3).grid(
-                row=i + count + 3, column=0, sticky="w", padx=3, pady=1
-            )
-
-        self.tab_control.add(tests_frame, text="   Data   ")
-
-        # plot stuff ----------------------------------------------------------
-        self.plot()
+        # shown in the order they're saved in
+        tests = self.editor_project.ordered_tests()
+        self.blanks = [test for test in tests if test.is_blank.get()]
+        self.trials = [test for test in tests if not test.is_blank.get()]
 
-        # evaluation stuff ----------------------------------------------------
+        # each tab is built the first time it's selected, or once the window is idle
+        data_frame = ttk.Frame(self)
         log_frame = ttk.Frame(self)
         log_frame.grid_columnconfigure(0, weight=1)
-        self.log_text = tk.scrolledtext.ScrolledText(
-            log_frame, background="white", state="disabled"
-        )
-        self.log_text.grid(sticky="ew")
+        self.log_text = None  # made when the log tab is built
+        self.results_table = None  # made when the data tab is built
+        self.tab_control.add(data_frame, text="   Data   ")
+        self.tab_control.add(self.plot_frame, text="   Plot   ")
         self.tab_control.add(log_frame, text="   Calculations   ")
+        self.pending_tabs = {
+            str(data_frame): partial(self.build_data_tab, data_frame),
+            str(self.plot_frame): self.plot,
+            str(log_frame): partial(self.build_log_tab, log_frame),
+        }
+        self.tab_control.bind("<<NotebookTabChanged>>", self.build_tab)
 
         button_frame = ttk.Frame(self)
         ttk.Button(button_frame, text="Save", command=self.save, width=10).grid(
@@ -149,64 +137,94 @@ class EvaluationWindow(tk.Toplevel):
             width=10,
         ).grid(row=0, column=1, padx=5)
         button_frame.grid(row=1, column=0, pady=5)
-        # update results
+        # update results, the tabs that are built will show them
         self.score()
+        self.build_tab()
+        self.after_idle(self.build_next_tab)
 
-    def plot(self) -> None:
-        """Destroys the old plot frame if it exists, then makes a new one."""
-        # close all pyplots to prevent memory leak
-        plt.close("all")
-        # get rid of our old plot tab
-        self.plot_frame.destroy()
-        self.plot_frame = ttk.Frame(self)
-        self.fig, self.axis = plt.subplots(figsize=(7.5, 4), dpi=100)
-        self.fig.patch.set_facecolor("#FAFAFA")
-        plt.subplots_adjust(wspace=0, hspace=0)
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
-        self.canvas.get_tk_widget().pack(fill="both", expand=True)
-        with plt.style.context("bmh"):
-            mpl.rcParams["axes.prop_cycle"] = mpl.cycler(color=COLORS)
-            self.axis.grid(color="darkgrey", alpha=0.65, linestyle="-")
-            self.axis.set_facecolor("w")
-            self.axis.clear()
-
-            # plot everything
-            for blank in self.blanks:
-                if blank.include_on_report.get():
-                    elapsed = []
-                    for reading in blank.readings:
-                        elapsed.append(reading["elapsedMin"])
-                    self.axis.plot(
-                        elapsed,
-                        blank.get_readings(),
-                        label=blank.label.get(),
-                        linestyle=("-."),
-                    )
-
-            for trial in self.trials:
-                if trial.include_on_report.get():
-                    elapsed = []
-                    for i, reading in enumerate(trial.readings):
-                        elapsed.append(trial.readings[i]["elapsedMin"])
-                    self.axis.plot(
-                        elapsed, trial.get_readings(), label=trial.label.get()
-                    )
+    def build_tab(self, *args) -> None:
+        """Builds the selected tab, if it hasn't been built yet.
 
-            self.axis.set_xlabel("Time (min)")
-            self.axis.set_ylabel("Pressure (psi)")
-            self.axis.set_ylim(top=self.editor_project.limit_psi.get())
-            self.axis.yaxis.set_major_locator(MultipleLocator(100))
-            self.axis.set_xlim((0, self.editor_project.limit_minutes.get()))
-            self.axis.legend(loc=0)
-            self.axis.margins(0)
-            plt.tight_layout()
+        Accepts event args passed from the notebook.
+        """
+        # extra unused args are passed in by tkinter
+        builder = self.pending_tabs.pop(self.tab_control.select(), None)
+        if builder is not None:
+            builder()
 
-        # finally, add to parent control
-        self.tab_control.add(self.plot_frame, text="   Plot   ")
-        self.tab_control.insert(1, self.plot_frame)
+    def build_next_tab(self) -> None:
+        """Builds one of the tabs that hasn't been built, then waits to do the next."""
+        if not self.winfo_exists() or len(self.pending_tabs) == 0:
+            return
+        tab = next(iter(self.pending_tabs))
+        self.pending_tabs.pop(tab)()
+        # let the window handle any events before building another
+        self.after_idle(self.build_next_tab)
+
+    def is_built(self, tab: tk.Widget) -> bool:
+        """Returns True if the passed tab has been built."""
+        return str(tab) not in self.pending_tabs
+
+    def build_data_tab(self, tests_frame: ttk.Frame) -> None:
+        """Builds a table of the Tests in the Project."""
+        tests_frame.grid_columnconfigure(0, weight=1)
+        self.results_table = TestResultsTable(tests_frame, self)
+        self.results_table.grid(row=0, column=0, sticky="nsew", padx=3, pady=3)
+
+    def build_log_tab(self, log_frame: ttk.Frame) -> None:
+        """Builds the calculations log."""
+        self.log_text = tk.scrolledtext.ScrolledText(
+            log_frame, background="white", state="disabled"
+        )
+        self.log_text.grid(sticky="ew")
+        self.to_log(self.log_lines)
+
+    def add_test(self, test: Test) -> None:
+        """Adds a copy of a newly saved Test, then rebuilds without reloading."""
+        self.editor_project.tests.append(test.copy())
+        self.build()
+
+    def plot(self) -> None:
+        """Updates the plot's lines in place, then schedules a redraw."""
+        # the tests are plotted blanks first, each color in order
+        tests = [test for test in self.blanks if test.include_on_report.get()]
+        tests += [test for test in self.trials if test.include_on_report.get()]
+        # there's no use plotting more points than the axes are pixels wide
+        # this is just for show, the scores use every reading
+        width = int(self.axis.bbox.width)
+        lines = {}
+        for i, test in enumerate(tests):
+            line = self.lines.pop(test, None)
+            if line is None:
+                (line,) = self.axis.plot([], [])
+            line.set_data(
+                *lttb(test.readings["elapsedMin"], test.get_readings(), width)
+            )
+            line.set_label(test.label.get())
+            line.set_color(COLORS[i % len(COLORS)])
+            line.set_linestyle("-." if test.is_blank.get() else "-")
+            lines[test] = line
+        for line in self.lines.values():  # these tests aren't plotted anymore
+            line.remove()
+        self.lines = lines
+
+        self.axis.set_ylim(0, self.editor_project.limit_psi.get())
+        self.axis.set_xlim((0, self.editor_project.limit_minutes.get()))
+        if self.axis.get_legend() is not None:
+            self.axis.get_legend().remove()
+        if len(lines) > 0:
+            self.axis.legend(handles=list(lines.values()), loc=0)
+        # coalesces with any other redraws before the next idle
+        self.canvas.draw_idle()
 
     def save(self) -> None:
         """Saves to file the project, most recent plot, and calculations log."""
+        if self.score_job is not None:  # catch up on the latest edits
+            self.score()
+        # the plot might not have been drawn yet
+        builder = self.pending_tabs.pop(str(self.plot_frame), None)
+        if builder is not None:
+            builder()
         # update image
         output_path = (
             f"{self.editor_project.numbers.get().replace(' ', '')} "
@@ -230,113 +248,64 @@ class EvaluationWindow(tk.Toplevel):
             os.path.dirname(self.editor_project.path.get()), output_path.strip()
         )
         with open(output_path, "w") as file:
-            file.write(self.log_text.get("1.0", "end-1c"))
+            file.write("".join(f"{line}\n" for line in self.log_lines))
 
-        self.editor_project.dump_json()
+        save_project(self.editor_project)
 
         self.build(reload=True)
 
+    def request_score(self, *args) -> None:
+        """Schedules a score, pushing back any that is already pending.
+
+        Accepts event args passed from the tkVar trace.
+        """
+        # extra unused args are passed in by tkinter
+        if self.score_job is not None:
+            self.after_cancel(self.score_job)
+            self.score_skips += 1
+        self.score_job = self.after(SCORE_DELAY_MS, self.run_pending_score)
+
+    def run_pending_score(self) -> None:
+        """Runs the score scheduled by request_score."""
+        self.score_job = None
+        self.score()
+
     def score(self, *args) -> None:
         """Updates the result for every Test in the Project.
 
         Accepts event args passed from the tkVar trace.
         """
         # extra unused args are passed in by tkinter
+        if self.score_job is not None:  # this pass covers the pending one too
+            self.after_cancel(self.score_job)
+            self.score_job = None
+            self.score_skips += 1
+        self.score_passes += 1
         start_time = time.time()
-        log = []
-        # scoring props
-        limit_minutes = self.editor_project.limit_minutes.get()
-        interval_seconds = self.editor_project.interval_seconds.get()
-        max_readings = round(limit_minutes * 60 / interval_seconds)
-        log.append("Max readings: limitMin * 60 / reading interval")
-        log.append(f"Max readings: {max_readings}")
-        baseline_area = round(self.editor_project.baseline.get() * max_readings)
-        log.append("Baseline area: baseline PSI * max readings")
-        log.append(
-            f"Baseline area: {self.editor_project.baseline.get()} * {max_readings}"
-        )
-        log.append(f"Baseline area: {baseline_area}")
-        log.append("-" * 80)
-        log.append("")
-
-        # select the blanks
-        blanks = []
-        for test in self.editor_project.tests:
-            if test.is_blank.get() and test.include_on_report.get():
-                blanks.append(test)
-
-        areas_over_blanks = []
-        for blank in blanks:
-            log.append(f"Evaluating {blank.name.get()}")
-            log.append(f"Considering data: {blank.pump_to_score.get()}")
-            readings = blank.get_readings()
-            log.append(f"Total readings: {len(readings)}")
-            log.append(f"Observed baseline: {blank.observed_baseline.get()} psi")
-            int_psi = sum(readings)
-            log.append("Integral PSI: sum of all pressure readings")
-            log.append(f"Integral PSI: {int_psi}")
-            area = self.editor_project.limit_psi.get() * len(readings) - int_psi
-            log.append("Area over blank: limit_psi * # of readings - integral PSI")
-            log.append(
-                f"Area over blank: {self.editor_project.limit_psi.get()} "
-                f"* {len(readings)} - {int_psi}"
-            )
-            log.append(f"Area over blank: {area}")
-            log.append("")
-            areas_over_blanks.append(area)
-
-        if len(areas_over_blanks) == 0:
+        scores = score_project(self.editor_project, self.score_cache)
+        if len(scores.trace.blanks) == 0:
+            if self.is_built(self.plot_frame):
+                self.plot()
             return
-        # get protectable area
-        avg_blank_area = round(sum(areas_over_blanks) / len(areas_over_blanks))
-        log.append(f"Avg. area over blanks: {avg_blank_area}")
-        avg_protectable_area = (
-            self.editor_project.limit_psi.get() * max_readings - avg_blank_area
-        )
-        log.append(
-            "Avg. protectable area: limit_psi * max_readings - avg. area over blanks"
-        )
-        log.append(
-            f"Avg. protectable area: {self.editor_project.limit_psi.get()} "
-            f"* {max_readings} - {avg_blank_area}"
+        for test, result in zip(self.editor_project.tests, scores.results):
+            if result is not None:
+                test.result.set(result)
+        log = format_trace(scores.trace)
+        log.insert(0, f"Evaluating results for {self.editor_project.name.get()}...")
+        log.insert(1, f"Finished in {round(time.time() - start_time, 3)} s")
+        log.insert(
+            2,
+            f"Scored {self.score_passes} times, "
+            f"skipped {self.score_skips} redundant passes \n",
         )
-        log.append(f"Avg. protectable area: {avg_protectable_area}")
-        log.append("-" * 80)
-        log.append("")
-
-        # select trials
-        trials = []
-        for test in self.editor_project.tests:
-            if not test.is_blank.get():
-                trials.append(test)
-
-        # get readings
-        for trial in trials:
-            log.append(f"Evaluating {trial.name.get()}")
-            log.append(f"Considering data: {trial.pump_to_score.get()}")
-            readings = trial.get_readings()
-            log.append(f"Total readings: {len(readings)}")
-            log.append(f"Observed baseline: {trial.observed_baseline.get()} psi")
-            int_psi = sum(readings) + (
-                (max_readings - len(readings)) * self.editor_project.limit_psi.get()
-            )
-            log.append("Integral PSI: sum of all pressure readings")
-            log.append(f"Integral PSI: {int_psi}")
-            result = round(1 - (int_psi - baseline_area) / avg_protectable_area, 3)
-            log.append(
-                "Result: 1 - (integral PSI - baseline area) / avg protectable area"
-            )
-            log.append(
-                f"Result: 1 - ({int_psi} - {baseline_area}) / {avg_protectable_area}"
-            )
-            log.append(f"Result: {result} \n")
-            trial.result.set(result)
-
-        self.plot()
 
-        log.insert(0, f"Evaluating results for {self.editor_project.name.get()}...")
-        log.insert(1, f"Finished in {round(time.time() - start_time, 3)} s \n")
-        self.to_log(log)
+        self.log_lines = log
+        if self.results_table is not None:
+            self.results_table.update_results()
+        if self.is_built(self.plot_frame):
+            self.plot()
+        if self.log_text is not None:
+            self.to_log(log)
 
     def to_log(self, log: list[str]) -> None:
         """Adds the passed log message to the Text widget in the Calculations frame."""
@@ -8,68 +8,173 @@ import typing
 from tkinter import ttk
 
 import matplotlib.pyplot as plt
-from matplotlib.animation import FuncAnimation
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
 
-# from matplotlib.ticker import MultipleLocator
+from scalewiz.helpers.configuration import get_config
+from scalewiz.helpers.downsample import lttb
 
 if typing.TYPE_CHECKING:
+    import tkinter as tk
+
+    from matplotlib.backend_bases import DrawEvent
+
     from scalewiz.models.test_handler import TestHandler
 
 LOGGER = logging.getLogger("scalewiz")
 
 
 class LivePlot(ttk.Frame):
-    """Renders data from a TestHandler as it is collected."""
+    """Renders data from a TestHandler as it is collected.
+
+    The lines are drawn once and then only updated, blitting them over a cached
+    background. The whole figure is only redrawn when the axes have to grow.
+    Frames are skipped when there are no new readings, capped by the max_fps
+    config setting, and stopped altogether while the plot is hidden.
+    """
 
     def __init__(self, parent: ttk.Frame, handler: TestHandler) -> None:
         """Initialize a LivePlot."""
         ttk.Frame.__init__(self, parent)
         self.handler = handler
+        self.count = 0  # how many readings the lines have been drawn with
+        self.background = None  # the figure without the lines, for blitting
+        self.job: str = None  # id of the next scheduled frame
+        # older config files may not have this table
+        max_fps = get_config().get("live_plot", {}).get("max_fps", 2.0)
+        self.min_frame_ms = round(1000 / max_fps)
 
         # matplotlib objects
-        fig, self.axis = plt.subplots(figsize=(5, 3), dpi=100)
-        fig.patch.set_facecolor("#FAFAFA")
-        self.axis.grid(color="darkgrey", alpha=0.65, linestyle="-")
-        self.axis.set_facecolor("w")
-        # self.axis.set_ylim(top=self.handler.project.limit_psi.get())
-        # self.axis.yaxis.set_major_locator(MultipleLocator(100))
-        # self.axis.set_xlim((0, None), auto=True)
+        # made without pyplot, so closing pyplot's figures doesn't affect it
+        with plt.style.context("bmh"):
+            fig = Figure(figsize=(5, 3), dpi=100)
+            self.axis = fig.add_subplot()
+            fig.patch.set_facecolor("#FAFAFA")
+            self.axis.set_xlabel("Time (min)")
+            self.axis.set_ylabel("Pressure (psi)")
+            # animated lines are left out of full draws, we blit them instead
+            (self.line1,) = self.axis.plot([], [], label="Pump 1", animated=True)
+            (self.line2,) = self.axis.plot([], [], label="Pump 2", animated=True)
+            self.axis.legend(loc=0)
         self.axis.margins(0)
-        plt.tight_layout()
-        plt.subplots_adjust(left=0.15, bottom=0.15, right=0.97, top=0.95)
+        fig.subplots_adjust(left=0.15, bottom=0.15, right=0.97, top=0.95)
+        self.reset_limits()
         self.canvas = FigureCanvasTkAgg(fig, master=self)
         self.canvas.get_tk_widget().pack(side="top", fill="both", expand=True)
-        interval = handler.project.interval_seconds.get() * 1000  # ms
-        self.ani = FuncAnimation(fig, self.animate, interval=interval)
+        # full draws happen on resizes and rescales, recache the background then
+        self.canvas.mpl_connect("draw_event", self.cache_background)
+        # wake up when the details pane is shown or the tab is selected
+        self.bind("<Map>", self.wake, add="+")
+        # the toplevel outlives this plot, so this is unbound in destroy
+        self.tab_binding = self.winfo_toplevel().bind(
+            "<<NotebookTabChanged>>", self.wake, add="+"
+        )
+        self.schedule()
+
+    def schedule(self) -> None:
+        """Schedules the next frame, no sooner than the frame rate cap allows."""
+        interval = round(self.handler.project.interval_seconds.get() * 1000)  # ms
+        self.job = self.after(max(interval, self.min_frame_ms), self.animate)
+
+    def wake(self, event: tk.Event = None) -> None:
+        """Restarts the animation if it was suspended."""
+        # the event argument is passed by tkinter
+        if self.job is None and self.winfo_exists():
+            self.schedule()
 
-    def animate(self, interval: float) -> None:
-        """Animates the live plot if a test isn't running."""
-        # the interval argument is used by matplotlib internally
+    def destroy(self) -> None:
+        """Stops the animation, then destroys the widget."""
+        if self.job is not None:
+            self.after_cancel(self.job)
+            self.job = None
+        if self.tab_binding is not None:
+            # unbind would also drop the other systems' plots' bindings,
+            # so only take this plot's script out of the toplevel's binding
+            toplevel = self.winfo_toplevel()
+            script = toplevel.bind("<<NotebookTabChanged>>")
+            kept = [line for line in script.split("\n") if self.tab_binding not in line]
+            toplevel.bind("<<NotebookTabChanged>>", "\n".join(kept))
+            toplevel.deletecommand(self.tab_binding)
+            self.tab_binding = None
+        ttk.Frame.destroy(self)
 
+    def animate(self) -> None:
+        """Animates the live plot if a test is running and there are new readings."""
+        self.job = None
+        if not self.winfo_viewable():  # suspend until wake is called
+            LOGGER.debug("%s: Suspended the live plot", self.handler.name)
+            return
+        self.schedule()
         # we can just skip this if the test isn't running
         if self.handler.is_running.get() and not self.handler.is_done.get():
-            # data access here 😳
+            # views into the handler's readings, we will share elapsed as an axis
+            elapsed, pump1, pump2, _ = self.handler.readings.view()
+            if len(elapsed) == self.count:  # nothing new to draw
+                return
             start = time.time()
-            LOGGER.debug("%s: Drawing a new plot ...", self.handler.name)
-            with plt.style.context("bmh"):
-                self.axis.clear()
-                self.axis.set_xlabel("Time (min)")
-                self.axis.set_ylabel("Pressure (psi)")
-                pump1 = []
-                pump2 = []
-                elapsed = []  # we will share this series as an axis
-                readings = list(self.handler.readings.queue)
-                for reading in readings:
-                    pump1.append(reading["pump 1"])
-                    pump2.append(reading["pump 2"])
-                    elapsed.append(reading["elapsedMin"])
-                self.axis.plot(elapsed, pump1, label="Pump 1")
-                self.axis.plot(elapsed, pump2, label="Pump 2")
-                self.axis.legend(loc=0)
-                LOGGER.debug(
-                    "%s: Drew a new plot for %s data points in %s s",
-                    self.handler.name,
-                    len(readings),
-                    round(time.time() - start, 3),
-                )
+            if len(elapsed) < self.count:  # a new test was started
+                self.count = 0
+                self.reset_limits()
+            # there's no use drawing more points than the axes are pixels wide
+            width = int(self.axis.bbox.width)
+            self.line1.set_data(*lttb(elapsed, pump1, width))
+            self.line2.set_data(*lttb(elapsed, pump2, width))
+            if self.grow_limits(elapsed, pump1, pump2):
+                self.canvas.draw()  # blits the lines via cache_background
+            else:
+                self.blit()
+            self.count = len(elapsed)
+            LOGGER.debug(
+                "%s: Drew a new plot for %s data points in %s s",
+                self.handler.name,
+                len(elapsed),
+                round(time.time() - start, 3),
+            )
+
+    def reset_limits(self) -> None:
+        """Sets the axes' limits for a test that hasn't collected any readings."""
+        self.axis.set_xlim(0, 1)
+        self.axis.set_ylim(0, 100)
+
+    def grow_limits(self, elapsed: typing.Any, *pressures: typing.Any) -> bool:
+        """Grows the axes to fit any new readings. Returns True if they changed."""
+        if len(elapsed) == self.count:
+            return False
+        # only look at the new readings, so this doesn't slow down as they pile up
+        latest = elapsed[-1]
+        start = self.count
+        highest = max(int(pressure[start:].max()) for pressure in pressures)
+        grew = False
+        right = self.axis.get_xlim()[1]
+        if latest > right:
+            right = max(latest, right * 1.5)
+            limit = self.handler.project.limit_minutes.get()
+            if latest <= limit:  # the test shouldn't run past here
+                right = min(right, limit)
+            self.axis.set_xlim(0, right)
+            grew = True
+        top = self.axis.get_ylim()[1]
+        if highest > top:
+            self.axis.set_ylim(0, max(highest, top * 1.5))
+            grew = True
+        return grew
+
+    def cache_background(self, event: DrawEvent = None) -> None:
+        """Caches the freshly drawn figure, then draws the lines over it."""
+        # the event argument is passed by matplotlib
+        self.background = self.canvas.copy_from_bbox(self.axis.bbox)
+        self.draw_lines()
+
+    def blit(self) -> None:
+        """Redraws only the lines, over the cached background."""
+        if self.background is None:  # nothing has been drawn yet
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self.draw_lines()
+
+    def draw_lines(self) -> None:
+        """Draws the lines onto the canvas and pushes the axes' area to the screen."""
+        self.axis.draw_artist(self.line1)
+        self.axis.draw_artist(self.line2)
+        self.canvas.blit(self.axis.bbox)
@@ -27,6 +27,15 @@ class ProjectReport(ttk.Frame):
         )
         render(lbl, ent, 0)
 
+        lbl = ttk.Label(self, text="Readings storage:")
+        ent = ttk.Combobox(
+            self,
+            values=["inline", "sidecar"],
+            textvariable=project.storage,
+            state="readonly",
+        )
+        render(lbl, ent, 1)
+
         # matplotlib stuff
         # todo implement color selection
         # colorsLbl = ttk.Label(self, text="Plot color cycle:")
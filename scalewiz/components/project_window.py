@@ -13,8 +13,10 @@ from scalewiz.components.project_report import ProjectReport
 from scalewiz.helpers.configuration import open_config
 from scalewiz.helpers.set_icon import set_icon
 from scalewiz.models.project import Project
+from scalewiz.models.repository import open_project, save_project
 
 if typing.TYPE_CHECKING:
+    from scalewiz.models.test import Test
     from scalewiz.models.test_handler import TestHandler
 
 
@@ -29,7 +31,7 @@ class ProjectWindow(tk.Toplevel):
         self.handler = handler
         self.editor_project = Project()
         if os.path.isfile(handler.project.path.get()):
-            self.editor_project.load_json(handler.project.path.get())
+            self.editor_project = open_project(handler.project.path.get())
         self.build()
 
     def build(self, reload: bool = False) -> None:
@@ -39,8 +41,7 @@ class ProjectWindow(tk.Toplevel):
             for test in self.editor_project.tests:
                 test.remove_traces()
             self.editor_project.remove_traces()  # clean up the old one for GC
-            self.editor_project = Project()
-            self.editor_project.load_json(self.handler.project.path.get())
+            self.editor_project = open_project(self.handler.project.path.get())
 
         self.winfo_toplevel().title(f"{self.handler.name}")
         set_icon(self)
@@ -74,6 +75,11 @@ class ProjectWindow(tk.Toplevel):
         ).grid(row=0, column=3, padx=5)
         button_frame.grid(row=1, column=0)
 
+    def add_test(self, test: Test) -> None:
+        """Adds a copy of a newly saved Test so saving here won't drop it."""
+        # none of the forms display tests, so there is nothing to rebuild
+        self.editor_project.tests.append(test.copy())
+
     def new(self) -> None:
         """Resets the form by connecting to a new Project."""
         self.editor_project = Project()
@@ -84,7 +90,7 @@ class ProjectWindow(tk.Toplevel):
         if self.editor_project.path.get() == "":
             self.save_as()
         else:
-            self.editor_project.dump_json()
+            save_project(self.editor_project)
             self.handler.load_project(self.editor_project.path.get())
             self.handler.view.build()
 
@@ -1,12 +1,12 @@
 """Simple frame that starts and stops the pumps on a timer."""
 
 import logging
-import time
 import tkinter as tk
-from concurrent.futures import ThreadPoolExecutor
-from tkinter import ttk
+from threading import Event, Lock
+from tkinter import messagebox, ttk
 
 from scalewiz.helpers.set_icon import set_icon
+from scalewiz.models.scheduler import Timer
 from scalewiz.models.test_handler import TestHandler
 
 LOGGER = logging.getLogger("pct-scalewiz")
@@ -19,8 +19,12 @@ class RinseWindow(tk.Toplevel):
         tk.Toplevel.__init__(self)
         self.winfo_toplevel().protocol("WM_DELETE_WINDOW", self.close)
         self.handler = handler
-        self.pool = ThreadPoolExecutor(max_workers=1)
-        self.stop = False
+        self.timer: Timer = None  # the next scheduled second of the rinse
+        self.rinse_start: float = None  # clock time the rinse was started
+        # the ticks run on the scheduler's threads; only they take the lock,
+        # since a worker holding it may be waiting on the mainloop for a tkVar
+        self.lock = Lock()
+        self.stop = Event()
 
         set_icon(self)
         self.winfo_toplevel().title(self.handler.name)
@@ -44,26 +48,67 @@ class RinseWindow(tk.Toplevel):
     def request_rinse(self) -> None:
         """Try to start a rinse cycle if a test isn't running."""
         if not self.handler.is_running.get() or self.handler.is_done.get():
-            self.pool.submit(self.rinse)
+            issues = []
+            self.handler.setup_pumps(issues)
+            if len(issues) > 0:  # eg. real pumps on a fast-forwarded clock
+                messagebox.showwarning("Couldn't start the rinse", "\n".join(issues))
+                for pump in (self.handler.pump1, self.handler.pump2):
+                    if pump is not None:
+                        pump.close()
+                return
+            self.timer = self.handler.scheduler.call_later(0, self.rinse)
 
     def rinse(self) -> None:
         """Run the pumps and disable the button for the duration of a timer."""
-        self.handler.setup_pumps()
-        self.handler.pump1.run()
-        self.handler.pump2.run()
-
-        self.button.configure(state="disabled")
-        duration = self.rinse_minutes.get() * 60
-        for i in range(duration):
-            if not self.stop:
+        with self.lock:
+            if self.stop.is_set():  # closed before it started
+                self.end_rinse()
+                return
+            # the pumps were set up by request_rinse
+            self.handler.pump1.run()
+            self.handler.pump2.run()
+
+            self.button.configure(state="disabled")
+            self.rinse_start = self.handler.clock.monotonic()
+            # the tick takes the lock itself, so give it its own deadline
+            self.timer = self.handler.scheduler.call_at(
+                self.rinse_start, self.rinse_tick, 0
+            )
+
+    def rinse_tick(self, i: int) -> None:
+        """Counts off a second of the rinse, then schedules the next one."""
+        with self.lock:
+            if self.stop.is_set():
+                return
+            duration = self.rinse_minutes.get() * 60
+            if i < duration:
                 self.txt.set(f"{i+1}/{duration} s")
-                time.sleep(1)
-            else:
-                break
+                self.timer = self.handler.scheduler.call_at(
+                    self.rinse_start + i + 1, self.rinse_tick, i + 1
+                )
+                return
+            self.timer = None
+            self.rinse_start = None
+            self.end_rinse()
         self.bell()
-        self.end_rinse()
         self.button.configure(state="normal")
 
+    def cancel_rinse(self, requested_at: float) -> None:
+        """Stops a rinse cycle early, recording how long the pumps took to stop."""
+        with self.lock:
+            if self.timer is not None:  # a tick may have been scheduled meanwhile
+                self.timer.cancel()
+                self.timer = None
+            started, self.rinse_start = self.rinse_start, None
+            # also closes the ports if the rinse was set up but never started
+            self.end_rinse()
+            if started is not None:
+                LOGGER.info(
+                    "%s: Stopped the rinse %.1f ms after the stop request",
+                    self.handler.name,
+                    (self.handler.clock.monotonic() - requested_at) * 1000,
+                )
+
     def end_rinse(self) -> None:
         """Stop the pumps if they are running, then close their ports."""
         if self.handler.pump1.is_open:
@@ -86,5 +131,11 @@ class RinseWindow(tk.Toplevel):
 
     def close(self) -> None:
         """Stops the rinse cycle and closes the rinse Toplevel."""
-        self.stop = True
+        self.stop.set()
+        if self.timer is not None:
+            self.timer.cancel()
+            # stop the pumps now rather than at the next tick
+            self.handler.scheduler.call_later(
+                0, self.cancel_rinse, self.handler.clock.monotonic()
+            )
         self.destroy()
@@ -9,11 +9,11 @@ from logging import getLogger
 from tkinter import ttk
 from tkinter.scrolledtext import ScrolledText
 
-import matplotlib.pyplot as plt
 import serial.tools.list_ports as list_ports
 
 from scalewiz.components.live_plot import LivePlot
 from scalewiz.helpers.validation import can_be_pos_float
+from scalewiz.models.pumps import list_simulated_devices
 
 if typing.TYPE_CHECKING:
     from typing import List
@@ -211,8 +211,6 @@ class TestHandlerView(ttk.Frame):
         self.new_button = ttk.Button(ent, text="New", command=self.handler.new_test)
 
         # rows 0-1 ---------------------------------------------------------------------
-        # close all pyplots to prevent memory leak
-        plt.close("all")
         self.plot_frame = LivePlot(self, self.handler)
         self.grid_columnconfigure(1, weight=1)  # let it grow
         self.grid_rowconfigure(1, weight=1)
@@ -241,6 +239,7 @@ class TestHandlerView(ttk.Frame):
         # extra unused args are passed in by tkinter
         def update() -> None:
             self.devices_list = sorted([i.device for i in list_ports.comports()])
+            self.devices_list.extend(list_simulated_devices())
             if len(self.devices_list) < 1:
                 self.devices_list = ["None found"]
 
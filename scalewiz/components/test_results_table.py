@@ -0,0 +1,208 @@
+"""Component for displaying the Tests in a Project as a table."""
+from __future__ import annotations
+
+import tkinter as tk
+import typing
+from tkinter import messagebox, ttk
+
+if typing.TYPE_CHECKING:
+    from typing import Union
+
+    from scalewiz.components.evaluation_window import EvaluationWindow
+    from scalewiz.models.test import Test
+
+# column id: (heading, width)
+COLUMNS = {
+    "label": ("Label", 180),
+    "minutes": ("Minutes", 90),
+    "pump": ("Pump", 70),
+    "baseline": ("Baseline", 65),
+    "max": ("Max", 55),
+    "clarity": ("Clarity", 80),
+    "notes": ("Notes", 220),
+    "result": ("Result", 60),
+    "report": ("Report", 55),
+}
+PUMPS = ["pump 1", "pump 2", "average"]
+CHECK = "✔"
+
+
+class TestResultsTable(ttk.Frame):
+    """Component for displaying the Tests in a Project as a table.
+
+    The label, pump and notes are edited in place by double clicking them,
+    and a Test is included on the report by clicking its Report cell.
+    Rows are only redrawn when their own Test changes.
+    """
+
+    def __init__(self, parent: tk.Widget, window: EvaluationWindow) -> None:
+        ttk.Frame.__init__(self, parent)
+        self.window = window
+        self.project = window.editor_project
+        self.tests: dict[str, Test] = {}  # maps row ids to Tests
+        self.editor: tk.Widget = None  # the cell editor, if one is open
+        self.editing: tuple[str, str] = None  # the row and column being edited
+        self.build()
+
+    def build(self) -> None:
+        """Make the UI."""
+        self.tree = ttk.Treeview(
+            self, columns=list(COLUMNS), height=20, selectmode="browse"
+        )
+        self.tree.heading("#0", text="Name", anchor="w")
+        self.tree.column("#0", width=200, stretch=False)
+        for column, (heading, width) in COLUMNS.items():
+            self.tree.heading(column, text=heading)
+            self.tree.column(
+                column, width=width, anchor="center", stretch=column == "notes"
+            )
+        scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        scrollbar.grid(row=0, column=1, sticky="ns")
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        blanks = self.tree.insert("", "end", text="Blanks:", open=True)
+        for test in self.window.blanks:
+            self.tests[self.tree.insert(blanks, "end")] = test
+        trials = self.tree.insert("", "end", text="Trials:", open=True)
+        for test in self.window.trials:
+            self.tests[self.tree.insert(trials, "end")] = test
+        for row in self.tests:
+            self.refresh(row)
+
+        self.tree.bind("<Double-1>", self.edit)
+        self.tree.bind("<Button-1>", self.click)
+        self.tree.bind("<Delete>", self.remove_from_project)
+        self.menu = tk.Menu(self, tearoff=0)
+        self.menu.add_command(label="Delete", command=self.remove_from_project)
+        self.tree.bind("<Button-3>", self.show_menu)
+
+    def values(self, test: Test) -> dict[str, Union[float, int, str]]:
+        """Returns the cell values for a Test's row."""
+        duration = round(
+            len(test.readings) * self.project.interval_seconds.get() / 60, 2
+        )
+        return {
+            "label": test.label.get(),
+            "minutes": f"{duration:.2f}, ({len(test.readings)})",
+            "pump": test.pump_to_score.get(),
+            "baseline": test.observed_baseline.get(),
+            "max": test.max_psi.get(),
+            "clarity": test.clarity.get(),
+            "notes": test.notes.get(),
+            "result": test.result.get(),
+            "report": CHECK if test.include_on_report.get() else "",
+        }
+
+    def refresh(self, row: str) -> None:
+        """Redraws a single row from its Test."""
+        test = self.tests[row]
+        values = self.values(test)
+        self.tree.item(
+            row, text=test.name.get(), values=[values[column] for column in COLUMNS]
+        )
+
+    def update_results(self) -> None:
+        """Redraws the result cells that have changed."""
+        for row, test in self.tests.items():
+            result = test.result.get()
+            if self.tree.set(row, "result") != str(result):
+                self.tree.set(row, "result", result)
+
+    def locate(self, event: tk.Event) -> tuple[str, str]:
+        """Returns the row id and column id under the mouse, if it's a Test's row."""
+        row = self.tree.identify_row(event.y)
+        if row not in self.tests:
+            return None, None
+        column = self.tree.identify_column(event.x)  # like "#1"
+        if column == "#0":
+            return row, None
+        return row, list(COLUMNS)[int(column[1:]) - 1]
+
+    def click(self, event: tk.Event) -> None:
+        """Commits any open editor, and toggles a Test's Report cell if clicked."""
+        # this runs before the editor would lose focus
+        if self.editor is not None:
+            self.commit(*self.editing)
+        row, column = self.locate(event)
+        if column == "report":
+            test = self.tests[row]
+            test.include_on_report.set(not test.include_on_report.get())
+            self.refresh(row)
+            self.window.request_score()
+
+    def edit(self, event: tk.Event) -> None:
+        """Opens an editor over the double clicked cell."""
+        row, column = self.locate(event)
+        if column not in ("label", "pump", "notes"):
+            return
+        self.close_editor()
+        test = self.tests[row]
+        x, y, width, height = self.tree.bbox(row, column)
+        if column == "pump":
+            self.editor = ttk.Combobox(self.tree, values=PUMPS, state="readonly")
+            self.editor.set(test.pump_to_score.get())
+            self.editor.bind("<<ComboboxSelected>>", lambda _: self.commit(row, column))
+        else:
+            self.editor = ttk.Entry(self.tree)
+            self.editor.insert(0, self.tree.set(row, column))
+            self.editor.select_range(0, "end")
+            self.editor.bind("<Return>", lambda _: self.commit(row, column))
+            self.editor.bind("<FocusOut>", lambda _: self.commit(row, column))
+        self.editor.bind("<Escape>", lambda _: self.close_editor())
+        self.editing = (row, column)
+        self.editor.place(x=x, y=y, width=width, height=height)
+        self.editor.focus_set()
+
+    def commit(self, row: str, column: str) -> None:
+        """Saves the editor's value to the Test, then closes the editor."""
+        if self.editor is None:
+            return
+        value = self.editor.get()
+        self.close_editor()
+        if value == self.tree.set(row, column):  # nothing changed
+            return
+        test = self.tests[row]
+        if column == "label":
+            test.label.set(value)
+        elif column == "pump":
+            test.pump_to_score.set(value)  # updates the baseline and max too
+        elif column == "notes":
+            test.notes.set(value)
+        self.refresh(row)
+        if column != "notes":  # the notes don't affect the scores or the plot
+            self.window.request_score()
+
+    def close_editor(self) -> None:
+        """Closes the cell editor, if there is one."""
+        if self.editor is not None:
+            editor, self.editor = self.editor, None
+            editor.destroy()
+
+    def show_menu(self, event: tk.Event) -> None:
+        """Shows the context menu for a Test's row."""
+        row, _ = self.locate(event)
+        if row is not None:
+            self.tree.selection_set(row)
+            self.menu.tk_popup(event.x_root, event.y_root)
+
+    def remove_from_project(self, *args) -> None:
+        """Removes the selected Test from the Project, then rebuilds the window.
+
+        Accepts event args passed from the key binding.
+        """
+        selection = self.tree.selection()
+        if len(selection) == 0 or selection[0] not in self.tests:
+            return
+        test = self.tests[selection[0]]
+        msg = (
+            "You are about to delete {} from {}.\n"
+            "This will become permanent once you save the project.\n"
+            "Do you wish to continue?"
+        ).format(test.name.get(), self.project.name.get())
+        remove = messagebox.askyesno("Delete test", msg)
+        if remove and test in self.project.tests:
+            self.project.tests.remove(test)
+            self.window.build()
@@ -0,0 +1,53 @@
+"""Converts project files between the ways their readings can be stored."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+
+from scalewiz.headless import init_tcl
+from scalewiz.models.project import Project
+
+LOGGER = logging.getLogger("scalewiz")
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    """Parses the arguments for a project to convert."""
+    parser = argparse.ArgumentParser(
+        prog="scalewiz convert",
+        description=(
+            "Store a project's readings inline in its JSON file, "
+            "or in a compact readings file beside it."
+        ),
+    )
+    parser.add_argument("project", help="path to the project's file")
+    parser.add_argument(
+        "--to", choices=["inline", "sidecar"], required=True, help="how to store them"
+    )
+    parser.add_argument(
+        "--output", help="where to save the converted project, instead of in place"
+    )
+    return parser.parse_args(argv)
+
+
+def run(argv: list[str] = None) -> int:
+    """Converts the project. Returns an exit code."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    init_tcl()
+    if not os.path.isfile(args.project):
+        LOGGER.error("No project file found at %s", args.project)
+        return 1
+    project = Project()
+    project.load_json(args.project)
+    if args.output is not None:
+        project.path.set(os.path.abspath(args.output))
+    project.storage.set(args.to)
+    project.dump_json()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
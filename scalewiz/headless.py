@@ -0,0 +1,121 @@
+"""Runs a Test from the command line, without a GUI."""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import tkinter as tk
+
+from scalewiz.models.clock import Clock, ScaledClock
+from scalewiz.models.scheduler import Scheduler
+from scalewiz.models.scoring import score_project
+from scalewiz.models.test_handler import TestHandler
+
+LOGGER = logging.getLogger("scalewiz")
+
+
+def init_tcl() -> None:
+    """Sets up a bare Tcl interpreter to hold the models' tkVars."""
+    # the models only need a Tcl interpreter to hold their tkVars, not a display
+    tk._default_root = tk.Tcl()  # pylint: disable=protected-access
+
+
+def parse_args(argv: list[str] = None) -> argparse.Namespace:
+    """Parses the arguments for a headless run."""
+    parser = argparse.ArgumentParser(
+        prog="scalewiz run",
+        description="Run a test and save it to a project file, without a GUI.",
+    )
+    parser.add_argument("project", help="path to the project's JSON file")
+    parser.add_argument("pump1", help="serial port for pump 1, eg. COM3")
+    parser.add_argument("pump2", help="serial port for pump 2, eg. COM4")
+    parser.add_argument("--name", default="", help="name of a blank")
+    parser.add_argument(
+        "--trial",
+        action="store_true",
+        help="run a chemical trial instead of a blank",
+    )
+    parser.add_argument("--chemical", default="", help="chemical for a trial")
+    parser.add_argument("--rate", type=float, default=0, help="ppm for a trial")
+    parser.add_argument("--clarity", default="Clear", help="clarity for a trial")
+    parser.add_argument("--notes", default="", help="notes on the test")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="fast-forward the test by this factor (simulated pumps only)",
+    )
+    parser.add_argument(
+        "--recover",
+        action="store_true",
+        help="recover any unfinished tests from the project's journals first",
+    )
+    return parser.parse_args(argv)
+
+
+def run(argv: list[str] = None) -> int:
+    """Runs a single Test, blocking until it is saved. Returns an exit code."""
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(name)s - %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    path = os.path.abspath(args.project)
+    if not os.path.isfile(path):
+        LOGGER.error("No project file found at %s", path)
+        return 1
+
+    init_tcl()
+    clock = Clock() if args.speed == 1 else ScaledClock(args.speed)
+    # there is no mainloop to hand off to, so callbacks run on this thread
+    scheduler = Scheduler(clock, workers=0)
+    handler = TestHandler(name="Headless", scheduler=scheduler)
+    handler.project.load_json(path)
+    LOGGER.info("Loaded %s", handler.project.name.get())
+    if args.recover:
+        handler.recover_tests(confirm=lambda title, msg: True)
+    handler.new_test()  # picks up the project's limits
+
+    test = handler.test
+    test.is_blank.set(not args.trial)
+    if args.trial:
+        test.chemical.set(args.chemical)
+        test.rate.set(args.rate)  # the name is set from these by a trace
+        test.clarity.set(args.clarity)
+    else:
+        test.name.set(args.name)
+    test.notes.set(args.notes)
+    handler.dev1.set(args.pump1)
+    handler.dev2.set(args.pump2)
+
+    issues = handler.check_test()
+    if len(issues) > 0:
+        for issue in issues:
+            LOGGER.error(issue)
+        for pump in (handler.pump1, handler.pump2):
+            if pump is not None:
+                pump.close()
+        return 1
+
+    handler.begin_test()
+    scheduler.call_later(0, handler.take_readings)
+    try:
+        scheduler.run()  # returns once the test is saved
+    except KeyboardInterrupt:
+        LOGGER.warning("Interrupted, saving the readings collected so far")
+        handler.request_stop()
+        scheduler.run()  # stops the pumps and saves the test
+
+    results = score_project(handler.project).results
+    # saving sorts the tests, so find the one we just ran
+    result = results[handler.project.tests.index(test)]
+    if result is not None:
+        LOGGER.info("Result for %s: %s", test.name.get(), result)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -10,7 +10,7 @@ from pathlib import Path
 from typing import Union
 
 from appdirs import user_config_dir
-from tomlkit import comment, document, dumps, loads, table
+from tomlkit import comment, document, dumps, item, loads, table
 
 LOGGER = getLogger("scalewiz.config")
 
@@ -119,6 +119,77 @@ def generate_default() -> document:
 
     doc["defaults"] = params
     doc["defaults"].comment("these will get used when making new projects")
+
+    # simulated pumps
+    simulation = table()
+
+    # tomlkit hands bools back unwrapped, so comment the item before adding it
+    enabled = item(False)
+    enabled.comment("list simulated pumps as devices, eg. sim:1")
+    simulation["enabled"] = enabled
+
+    simulation["devices"] = 2
+    simulation["devices"].comment("how many simulated pumps to list")
+
+    simulation["speed"] = 1.0
+    simulation["speed"].comment("fast-forward simulated tests, eg. 100.0")
+
+    simulation["baseline_psi"] = 75
+    simulation["baseline_psi"].comment("psi before the capillary starts to scale")
+
+    simulation["onset_minutes"] = 10.0
+    simulation["onset_minutes"].comment("minutes before the capillary starts to scale")
+
+    simulation["tau_minutes"] = 3.0
+    simulation["tau_minutes"].comment("time constant for the exponential rise")
+
+    simulation["rise_psi"] = 20.0
+    simulation["rise_psi"].comment("scale factor for the exponential rise")
+
+    simulation["noise_psi"] = 2.0
+    simulation["noise_psi"].comment("standard deviation of the pressure noise")
+
+    simulation["latency_ms"] = 30.0
+    simulation["latency_ms"].comment("time for a pump to answer a command")
+
+    simulation["jitter_ms"] = 10.0
+    simulation["jitter_ms"].comment("random variation in the latency")
+
+    simulation["failure_rate"] = 0.0
+    simulation["failure_rate"].comment("fraction of commands that fail, 0.0 to 1.0")
+
+    doc["simulation"] = simulation
+    doc["simulation"].comment("stand-ins for the pumps, for testing without hardware")
+
+    watchdog = table()
+
+    enabled = item(True)
+    enabled.comment("check the pressure limit between readings")
+    watchdog["enabled"] = enabled
+
+    watchdog["interval"] = 0.25
+    watchdog["interval"].comment("seconds between checks, a positive float")
+
+    doc["watchdog"] = watchdog
+    doc["watchdog"].comment("stops a test as soon as it goes over the pressure limit")
+
+    live_plot = table()
+
+    live_plot["max_fps"] = 2.0
+    live_plot["max_fps"].comment("most times per second to redraw, a positive float")
+
+    doc["live_plot"] = live_plot
+    doc["live_plot"].comment("the plot shown while a test is running")
+
+    storage = table()
+
+    storage["readings"] = "inline"
+    storage["readings"].comment(
+        'choose from ("inline", "sidecar"), a compact file beside the project'
+    )
+
+    doc["storage"] = storage
+    doc["storage"].comment("how new projects keep their readings")
     # all done
     return doc
 
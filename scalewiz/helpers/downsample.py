@@ -0,0 +1,50 @@
+"""Downsample a series for plotting without losing its shape."""
+
+# based on Largest-Triangle-Three-Buckets, from Sveinn Steinarsson's thesis
+# https://skemman.is/bitstream/1946/15343/3/SS_MSc_thesis.pdf
+from __future__ import annotations
+
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> tuple[np.ndarray]:
+    """Downsample a series to about threshold points, keeping its peaks and dips.
+
+    The first and last points are kept, and the rest are split into buckets.
+    From each bucket we keep the point that makes the largest triangle with the
+    neighboring buckets' averages. Classic LTTB uses the point picked from the
+    previous bucket instead of its average, but that has to be done one bucket
+    at a time. This way every bucket is picked at once.
+    Returns the series as-is if it's already small enough.
+    """
+    size = len(x)
+    if threshold >= size or threshold < 3:
+        return x, y
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # split the points between the first and last into threshold - 2 buckets
+    edges = np.linspace(1, size - 1, threshold - 1).astype(np.int64)
+    starts = edges[:-1]
+    lengths = np.diff(edges)
+    x_means = np.add.reduceat(x[1:-1], starts - 1) / lengths
+    y_means = np.add.reduceat(y[1:-1], starts - 1) / lengths
+
+    # every bucket is flanked by its neighbors' averages, or the series' ends
+    x_prev = np.concatenate(([x[0]], x_means[:-1]))
+    y_prev = np.concatenate(([y[0]], y_means[:-1]))
+    x_next = np.concatenate((x_means[1:], [x[-1]]))
+    y_next = np.concatenate((y_means[1:], [y[-1]]))
+
+    # the area of each point's triangle, give or take a factor of 2
+    bucket = np.repeat(np.arange(threshold - 2), lengths)
+    areas = np.abs(
+        (x_prev[bucket] - x_next[bucket]) * (y[1:-1] - y_prev[bucket])
+        - (x_prev[bucket] - x[1:-1]) * (y_next[bucket] - y_prev[bucket])
+    )
+    # sort by bucket, then area, so each bucket's largest is its last
+    order = np.lexsort((areas, bucket))
+    picked = order[np.cumsum(lengths) - 1] + 1
+
+    keep = np.concatenate(([0], picked, [size - 1]))
+    return x[keep], y[keep]
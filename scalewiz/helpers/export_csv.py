@@ -44,18 +44,8 @@ def export_csv(project: Project) -> None:
         "clarity": [],
         "plotPath": project.plot.get(),
     }
-    # filter the blanks and trials to sort them
-    blanks = [
-        test
-        for test in project.tests
-        if test.include_on_report.get() and test.is_blank.get()
-    ]
-    trials = [
-        test
-        for test in project.tests
-        if test.include_on_report.get() and not test.is_blank.get()
-    ]
-    tests = blanks + trials
+    # blanks then trials, in the order they're saved in
+    tests = [test for test in project.ordered_tests() if test.include_on_report.get()]
 
     output_dict["name"] = [test.name.get() for test in tests]
     output_dict["isBlank"] = [test.is_blank.get() for test in tests]
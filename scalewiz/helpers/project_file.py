@@ -0,0 +1,120 @@
+"""Functions for reading and writing project files a Test at a time."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from typing import Any, Callable
+
+INDENT = " " * 8  # how deep each Test sits in a project file
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def split_tests(text: str) -> tuple[dict, list[str]]:
+    """Parses a project file, also returning the text of each Test as written.
+
+    Each Test's readings are left as JSON text. They're the bulk of a project
+    file, so they can be decoded with json.loads when they're first needed
+    instead.
+    """
+    decoder = json.JSONDecoder()
+    blobs = []
+
+    def skip(i: int, expected: str = None) -> int:
+        """Returns the index after any whitespace, and expected if it's passed."""
+        i = WHITESPACE.match(text, i).end()
+        if expected is not None:
+            if not text.startswith(expected, i):
+                raise ValueError(f"Expected {expected!r} at char {i} of project file")
+            i = WHITESPACE.match(text, i + 1).end()
+        return i
+
+    def more(i: int, closing: str) -> tuple[int, bool]:
+        """Skips a comma or closing bracket. Returns the index, and if more follow."""
+        if text.startswith(closing, i):
+            return i + 1, False
+        return skip(i, ","), True
+
+    def parse_object(
+        i: int, parse_value: Callable[[str, int], tuple[Any, int]]
+    ) -> tuple[dict, int]:
+        """Parses the object at i, using parse_value(key, i) for each value."""
+        obj = {}
+        i = skip(i, "{")
+        i, pending = (i + 1, False) if text.startswith("}", i) else (i, True)
+        while pending:
+            key, i = decoder.raw_decode(text, i)
+            i = skip(i, ":")
+            obj[key], i = parse_value(key, i)
+            i, pending = more(skip(i), "}")
+        return obj, i
+
+    def parse_readings(i: int) -> tuple[str, int]:
+        """Returns the text of the array at i, and the index after it."""
+        # readings are flat objects of numbers, so the first ] usually ends them,
+        # unless it's nested or in a string; without escapes, that's an odd quote
+        end = text.find("]", i) + 1
+        if (
+            end == 0
+            or text.find("[", i + 1, end) != -1
+            or text.find("\\", i, end) != -1
+            or text.count('"', i, end) % 2 != 0
+        ):
+            _, end = decoder.raw_decode(text, i)
+        return text[i:end], end
+
+    def parse_test(key: str, i: int) -> tuple[Any, int]:
+        if key == "readings" and text.startswith("[", i):
+            return parse_readings(i)
+        return decoder.raw_decode(text, i)
+
+    def parse_project(key: str, i: int) -> tuple[Any, int]:
+        if key != "tests" or not text.startswith("[", i):
+            return decoder.raw_decode(text, i)
+        tests = []
+        i = skip(i, "[")
+        i, items = (i + 1, False) if text.startswith("]", i) else (i, True)
+        while items:
+            start = i
+            test, i = parse_object(i, parse_test)
+            tests.append(test)
+            blobs.append(text[start:i])
+            i, items = more(skip(i), "]")
+        return tests, i
+
+    obj, i = parse_object(0, parse_project)
+    if skip(i) != len(text):
+        raise ValueError(f"Extra data at char {skip(i)} of project file")
+    return obj, blobs
+
+
+def join_tests(obj: dict, blobs: list[str]) -> str:
+    """Returns the project as JSON, with the text of each Test as its tests.
+
+    Matches json.dumps with indent=4, as long as the blobs do.
+    """
+    text = json.dumps({**obj, "tests": None}, indent=4)
+    tests = "[]"
+    if len(blobs) > 0:
+        tests = "[\n" + ",\n".join(INDENT + blob for blob in blobs) + "\n    ]"
+    # quotes in strings are escaped, so this can only match the key itself
+    return text.replace('"tests": null', f'"tests": {tests}', 1)
+
+
+def write_atomic(path: str, text: str) -> None:
+    """Writes the text to the file at path, replacing it only once it's on disk.
+
+    If this is interrupted, the file is left as it was.
+    """
+    temp = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp, "w") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp, path)
+    finally:
+        if os.path.isfile(temp):
+            os.remove(temp)
@@ -4,15 +4,17 @@
 # but modifying in-place seems rude
 # http://www.compciv.org/guides/python/fundamentals/lists-mutability/
 import re
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def natural_key(text: str) -> tuple:
+    """Returns a key that sorts text in the way that humans expect, eg. 2 before 10."""
+    # splitting on a captured group puts the runs of digits at the odd indices
+    chunks = re.split("([0-9]+)", text)
+    return tuple(int(c) if i % 2 == 1 else c for i, c in enumerate(chunks))
 
 
 def sort_nicely(things: list) -> list:
     """Sort the given list in the way that humans expect."""
-
-    new_list = things.copy()
-    convert = lambda text: int(text) if text.isdigit() else text  # noqa: E731
-    alnum_key = lambda key: [  # noqa: E731
-        convert(c) for c in re.split("([0-9]+)", key)
-    ]
-    new_list.sort(key=alnum_key)
-    return new_list
+    return sorted(things, key=natural_key)
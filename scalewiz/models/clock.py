@@ -0,0 +1,37 @@
+"""Clocks for telling time in the readings loop."""
+
+from __future__ import annotations
+
+import time
+
+
+class Clock:
+    """Tells real time. Tests and simulated pumps get the time through a Clock."""
+
+    speed = 1.0  # how many clock seconds pass per real second
+
+    def monotonic(self) -> float:
+        """Returns the clock's monotonic time in seconds."""
+        # pylint: disable=no-self-use
+        return time.monotonic()
+
+    def sleep(self, seconds: float) -> None:
+        """Sleeps for the passed number of clock seconds."""
+        # pylint: disable=no-self-use
+        time.sleep(max(seconds, 0))
+
+
+class ScaledClock(Clock):
+    """Fast-forwards time by a factor of speed, eg. for running simulated tests."""
+
+    def __init__(self, speed: float) -> None:
+        self.speed = speed
+        self.origin = time.monotonic()
+
+    def monotonic(self) -> float:
+        """Returns the clock's monotonic time in seconds."""
+        return self.origin + (time.monotonic() - self.origin) * self.speed
+
+    def sleep(self, seconds: float) -> None:
+        """Sleeps for the passed number of clock seconds."""
+        time.sleep(max(seconds, 0) / self.speed)
@@ -0,0 +1,109 @@
+"""An append-only journal of readings, used to recover a Test after a crash."""
+
+from __future__ import annotations
+
+import glob
+import json
+import logging
+import os
+from datetime import date
+from time import monotonic, time
+
+from scalewiz.models.readings import DTYPES
+from scalewiz.models.test import Test
+
+LOGGER = logging.getLogger("scalewiz")
+
+EXT = ".journal"
+OPEN_JOURNALS: set[str] = set()  # paths of journals still being written to
+
+
+class Journal:
+    """Appends each reading of a Test to a file in the project's logs dir.
+
+    The first line is a JSON header with the project path and the Test's metadata.
+    Each line after that is a JSON array of elapsed, pump 1, pump 2, average.
+    Writes are buffered, then flushed and fsynced every sync_seconds.
+    """
+
+    def __init__(self, path: str, sync_seconds: float = 10.0) -> None:
+        self.path = path
+        self.sync_seconds = sync_seconds
+        self.file = open(path, "a")
+        self.last_sync = monotonic()
+        OPEN_JOURNALS.add(path)
+
+    @classmethod
+    def start(cls: type[Journal], project_path: str, test: Test) -> Journal:
+        """Starts a new Journal for the Test in the project's logs dir."""
+        project_path = os.path.abspath(project_path)
+        logs_dir = os.path.join(os.path.dirname(project_path), "logs")
+        if not os.path.isdir(logs_dir):
+            os.mkdir(logs_dir)
+        file_name = f"{round(time())}_{test.name.get()}_{date.today()}{EXT}"
+        journal = cls(os.path.join(logs_dir, file_name))
+        header = {"project": project_path, "test": test.metadata()}
+        journal.file.write(json.dumps(header) + "\n")
+        journal.sync()
+        LOGGER.info("Started a journal at %s", journal.path)
+        return journal
+
+    def append(self, elapsed: float, psi1: int, psi2: int, average: int) -> None:
+        """Writes a reading to the journal, syncing to disk if it is due."""
+        self.file.write(json.dumps([elapsed, psi1, psi2, average]) + "\n")
+        if monotonic() - self.last_sync >= self.sync_seconds:
+            self.sync()
+
+    def sync(self) -> None:
+        """Flushes buffered readings and forces them to disk."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.last_sync = monotonic()
+
+    def close(self, remove: bool = False) -> None:
+        """Closes the journal, removing the file once its Test is safely saved."""
+        if not self.file.closed:
+            self.sync()
+            self.file.close()
+        OPEN_JOURNALS.discard(self.path)
+        if remove and os.path.isfile(self.path):
+            os.remove(self.path)
+            LOGGER.info("Removed the journal at %s", self.path)
+
+
+def find_journals(project_path: str) -> list[str]:
+    """Returns paths to any leftover journals for the project at the passed path."""
+    project_path = os.path.abspath(project_path)
+    logs_dir = os.path.join(os.path.dirname(project_path), "logs")
+    found = []
+    for path in sorted(glob.glob(os.path.join(logs_dir, f"*{EXT}"))):
+        if path in OPEN_JOURNALS:
+            continue
+        try:
+            with open(path, "r") as file:
+                header = json.loads(file.readline())
+        except (OSError, ValueError):
+            LOGGER.warning("Couldn't read the journal at %s", path)
+            continue
+        if header.get("project") == project_path:
+            found.append(path)
+    return found
+
+
+def replay(path: str) -> Test:
+    """Returns a Test rebuilt from the journal at the passed path."""
+    with open(path, "r") as file:
+        header = json.loads(file.readline())
+        rows = []
+        for line in file:
+            try:
+                rows.append(json.loads(line))
+            except ValueError:  # the last line may have been cut off mid-write
+                LOGGER.warning("Skipped an incomplete line in %s", path)
+                break
+    entry = header["test"]
+    entry["readings"] = [dict(zip(DTYPES, row)) for row in rows]
+    test = Test()
+    test.load_json(entry)
+    LOGGER.info("Replayed %s readings from %s", len(rows), path)
+    return test
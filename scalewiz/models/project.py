@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 import tkinter as tk
+from typing import Union
 
 from scalewiz.helpers.configuration import get_config, update_config
-from scalewiz.helpers.sort_nicely import sort_nicely
+from scalewiz.helpers.project_file import join_tests, split_tests, write_atomic
+from scalewiz.helpers.sort_nicely import natural_key
+from scalewiz.models.sidecar import append_readings, sidecar_path
 from scalewiz.models.test import Test
 
 LOGGER = logging.getLogger("scalewiz")
@@ -30,6 +32,8 @@ class Project:
         self.uptake_seconds = tk.DoubleVar()
         # report stuff
         self.output_format = tk.StringVar()
+        # where the readings are saved, "inline" in the JSON or in a "sidecar" file
+        self.storage = tk.StringVar()
         # metadata for reporting
         self.customer = tk.StringVar()
         self.submitted_by = tk.StringVar()
@@ -70,6 +74,8 @@ class Project:
         self.temperature.set(defaults.get("test_temperature"))
         self.flowrate.set(defaults.get("flowrate"))
         self.uptake_seconds.set(defaults.get("uptake_time"))
+        # older config files may not have this table
+        self.storage.set(config.get("storage", {}).get("readings", "inline"))
         # this must never be <= 0
         if self.interval_seconds.get() <= 0:
             self.interval_seconds.set(1)
@@ -87,26 +93,94 @@ class Project:
         if path is None:
             path = self.path.get()
 
-        blanks = [test for test in self.tests if test.is_blank.get()]
-        trials = [test for test in self.tests if not test.is_blank.get()]
-        blank_labels = sort_nicely([test.label.get().lower() for test in blanks])
-        trial_labels = sort_nicely([test.label.get().lower() for test in trials])
-        tests = []
-        for label in blank_labels:
-            for test in self.tests:
-                if test.label.get().lower() == label:
-                    tests.append(test)
-
-        for label in trial_labels:
-            for test in self.tests:
-                if test.label.get().lower() == label:
-                    tests.append(test)
-
-        self.tests.clear()
-        for test in tests:
-            self.tests.append(test)
+        self.tests[:] = self.ordered_tests()  # others may hold on to the list
+
+        sidecar = None
+        if self.storage.get() == "sidecar":
+            sidecar = sidecar_path(path)
+            # only readings that aren't in the file yet are added to it
+            unsaved = [
+                test
+                for test in self.tests
+                if test.stored_at is None or test.stored_at[0] != sidecar
+            ]
+            offsets = append_readings(sidecar, [test.readings for test in unsaved])
+            for test, offset in zip(unsaved, offsets):
+                test.stored_at = (sidecar, offset, len(test.readings))
 
+        metadata = self.metadata()
         this = {
+            "info": metadata["info"],
+            "params": metadata["params"],
+            "tests": None,  # filled in with each Test's own JSON
+            "outputFormat": metadata["outputFormat"],
+            "plot": metadata["plot"],
+        }
+        # relative, so it can be moved with the project; null for inline readings
+        this["readingsFile"] = None
+        if sidecar is not None:
+            this["readingsFile"] = os.path.basename(sidecar)
+
+        # only Tests that changed since they were loaded or saved are serialized
+        blobs = [test.to_json(sidecar) for test in self.tests]
+        write_atomic(path, join_tests(this, blobs))
+        LOGGER.info("Saved %s to %s", self.name.get(), path)
+        update_config("recents", "analyst", self.analyst.get())
+        update_config("recents", "project", self.path.get())
+
+    def load_json(self, path: str) -> None:
+        """Return a Project from a passed path to a JSON dump."""
+        path = os.path.abspath(path)
+        if os.path.isfile(path):
+            LOGGER.info("Loading from %s", path)
+            with open(path, "r") as file:
+                # each Test decodes its own readings when they're first needed
+                obj, blobs = split_tests(file.read())
+
+        # we expect the data files to be shared over Dropbox, etc.
+        if path != obj.get("info").get("path"):
+            LOGGER.warning(
+                "Opened a Project whose actual path didn't match its path property"
+            )
+            obj["info"]["path"] = path
+
+        self.load_metadata(obj)
+
+        # projects keep the storage they were saved with; older projects that
+        # don't say use the config's default
+        sidecar = None
+        if obj.get("readingsFile") is not None:
+            sidecar = os.path.join(os.path.dirname(path), obj.get("readingsFile"))
+            self.storage.set("sidecar")
+        elif "readingsFile" in obj:
+            self.storage.set("inline")
+
+        for entry, blob in zip(obj.get("tests"), blobs):
+            test = Test()
+            test.load_json(entry, sidecar)
+            # reuse the Test's text when saving, unless loading it changed anything
+            if test.metadata() == {key: entry.get(key) for key in test.metadata()}:
+                test.serialized = (test.json_state(sidecar), blob)
+            self.tests.append(test)
+
+    def ordered_tests(self) -> list[Test]:
+        """Returns the Tests in the order they're saved and shown.
+
+        That's blanks, then trials, each ordered by label in the way that humans
+        expect. Tests with the same label keep their order. Sorting a list that's
+        already in order, like the one saved last time, only takes linear time.
+        """
+        return sorted(
+            self.tests,
+            key=lambda test: (
+                not test.is_blank.get(),
+                natural_key(test.label.get().lower()),
+            ),
+        )
+
+    def metadata(self) -> dict[str, Union[dict, str]]:
+        """Returns a dict representation of the Project, without its Tests."""
+        return {
             "info": {
                 "customer": self.customer.get(),
                 "submittedBy": self.submitted_by.get(),
@@ -135,32 +209,12 @@ class Project:
                 "flowrate": self.flowrate.get(),
                 "uptake": self.uptake_seconds.get(),
             },
-            "tests": [test.to_dict() for test in self.tests],
             "outputFormat": self.output_format.get(),
             "plot": os.path.abspath(self.plot.get()),
         }
 
-        with open(path, "w") as file:
-            json.dump(this, file, indent=4)
-        LOGGER.info("Saved %s to %s", self.name.get(), path)
-        update_config("recents", "analyst", self.analyst.get())
-        update_config("recents", "project", self.path.get())
-
-    def load_json(self, path: str) -> None:
-        """Return a Project from a passed path to a JSON dump."""
-        path = os.path.abspath(path)
-        if os.path.isfile(path):
-            LOGGER.info("Loading from %s", path)
-            with open(path, "r") as file:
-                obj = json.load(file)
-
-        # we expect the data files to be shared over Dropbox, etc.
-        if path != obj.get("info").get("path"):
-            LOGGER.warning(
-                "Opened a Project whose actual path didn't match its path property"
-            )
-            obj["info"]["path"] = path
-
+    def load_metadata(self, obj: dict[str, Union[dict, str]]) -> None:
+        """Load the Project's values, but not its Tests, from a JSON object."""
         info = obj.get("info")
         self.customer.set(info.get("customer"))
         self.submitted_by.set(info.get("submittedBy"))
@@ -192,10 +246,13 @@ class Project:
         self.plot.set(obj.get("plot"))
         self.output_format.set(obj.get("outputFormat"))
 
-        for entry in obj.get("tests"):
-            test = Test()
-            test.load_json(entry)
-            self.tests.append(test)
+    def copy(self) -> Project:
+        """Returns a copy of the Project with copies of its Tests, for an editor."""
+        project = Project()
+        project.load_metadata(self.metadata())
+        project.storage.set(self.storage.get())
+        project.tests = [test.copy() for test in self.tests]
+        return project
 
     def remove_traces(self) -> None:
         """Remove tkVar traces to allow the GC to do its thing."""
@@ -0,0 +1,51 @@
+"""Selects a pump backend for a device."""
+
+from __future__ import annotations
+
+import typing
+
+from py_hplc import NextGenPump
+
+from scalewiz.helpers.configuration import get_config
+from scalewiz.models.clock import Clock, ScaledClock
+from scalewiz.models.simulated_pump import SimulatedPump
+
+if typing.TYPE_CHECKING:
+    from logging import Logger
+    from typing import Union
+
+# devices named like "sim:1" get a SimulatedPump instead of a serial port
+SIM_PREFIX = "sim:"
+
+
+def get_simulation() -> dict[str, Union[bool, float, int]]:
+    """Returns the simulation settings from the config."""
+    # older config files may not have this table
+    return dict(get_config().get("simulation", {}))
+
+
+def list_simulated_devices() -> list[str]:
+    """Returns the names of the simulated devices, if the simulation is enabled."""
+    settings = get_simulation()
+    if not settings.get("enabled", False):
+        return []
+    return [f"{SIM_PREFIX}{i + 1}" for i in range(settings.get("devices", 2))]
+
+
+def make_clock() -> Clock:
+    """Returns a Clock, fast-forwarded if the simulation asks for it."""
+    settings = get_simulation()
+    speed = settings.get("speed", 1.0)
+    if settings.get("enabled", False) and speed != 1:
+        return ScaledClock(speed)
+    return Clock()
+
+
+def make_pump(device: str, logger: Logger = None, clock: Clock = None) -> NextGenPump:
+    """Returns a pump for the passed device, simulated if the name asks for it."""
+    if device.startswith(SIM_PREFIX):
+        settings = get_simulation()
+        for key in ("enabled", "devices", "speed"):
+            settings.pop(key, None)
+        return SimulatedPump(device, logger, clock=clock, **settings)
+    return NextGenPump(device, logger)
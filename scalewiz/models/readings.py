@@ -0,0 +1,95 @@
+"""A compact, columnar store for pressure readings."""
+
+from __future__ import annotations
+
+import numpy as np
+
+# each reading is stored across these columns, keyed as in the project JSON
+DTYPES = {
+    "elapsedMin": np.float64,
+    "pump 1": np.int64,
+    "pump 2": np.int64,
+    "average": np.int64,
+}
+
+
+class Readings:
+    """Preallocated columns of readings.
+
+    Appends write into the preallocated columns, so there is a single writer and
+    any number of readers. Readers get views into the columns rather than copies.
+    """
+
+    def __init__(self, capacity: int = 0) -> None:
+        self.count = 0  # the number of readings collected so far
+        self.columns: dict[str, np.ndarray] = {}
+        self.clear(capacity)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        """Returns a view of the named column."""
+        return self.columns[key][: self.count]
+
+    def append(self, elapsed: float, psi1: int, psi2: int, average: int) -> None:
+        """Adds a reading to the end of the columns."""
+        if self.count == len(self.columns["elapsedMin"]):
+            self.grow()
+        i = self.count
+        self.columns["elapsedMin"][i] = elapsed
+        self.columns["pump 1"][i] = psi1
+        self.columns["pump 2"][i] = psi2
+        self.columns["average"][i] = average
+        # only publish the reading once it is completely written
+        self.count += 1
+
+    def clear(self, capacity: int = None) -> None:
+        """Drops all readings, preallocating room for capacity more."""
+        if capacity is None:
+            capacity = len(self.columns.get("elapsedMin", ()))
+        self.columns = {
+            key: np.zeros(max(capacity, 0), dtype) for key, dtype in DTYPES.items()
+        }
+        self.count = 0
+
+    def grow(self) -> None:
+        """Doubles the capacity of the columns. Views already handed out stay valid."""
+        capacity = max(len(self.columns["elapsedMin"]) * 2, 16)
+        columns = {}
+        for key, column in self.columns.items():
+            columns[key] = np.zeros(capacity, DTYPES[key])
+            columns[key][: self.count] = column[: self.count]
+        self.columns = columns
+
+    def view(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Returns consistent views of the elapsed, pump 1, pump 2, average columns."""
+        count = self.count
+        return tuple(column[:count] for column in self.columns.values())
+
+    def copy(self) -> Readings:
+        """Returns a copy of the readings, trimmed to size."""
+        readings = Readings()
+        readings.columns = {key: self[key].copy() for key in DTYPES}
+        readings.count = self.count
+        return readings
+
+    @classmethod
+    def from_list(cls: type[Readings], readings: list[dict]) -> Readings:
+        """Returns Readings from a list of flat reading dicts."""
+        if readings is None:
+            readings = []
+        this = cls()
+        this.columns = {
+            key: np.fromiter(
+                (reading[key] for reading in readings), dtype, count=len(readings)
+            )
+            for key, dtype in DTYPES.items()
+        }
+        this.count = len(readings)
+        return this
+
+    def to_list(self) -> list[dict]:
+        """Returns the readings as a list of flat reading dicts."""
+        columns = {key: self[key].tolist() for key in DTYPES}
+        return [dict(zip(columns.keys(), values)) for values in zip(*columns.values())]
@@ -0,0 +1,63 @@
+"""Keeps each project file parsed once per version on disk, handing out copies."""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+
+from scalewiz.models.project import Project
+
+LOGGER = logging.getLogger("scalewiz")
+
+MAX_PROJECTS = 8  # how many files to keep parsed at once
+# maps paths to ((mtime, size), Project), least recently used first
+# the Projects here are only ever copied, never edited
+_CACHE: dict[str, tuple[tuple[int, int], Project]] = {}
+LOCK = threading.Lock()  # no tkVars are touched while this is held
+
+
+def version(path: str) -> tuple[int, int]:
+    """Returns what tells one version of the file at path from another."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def remember(path: str, key: tuple[int, int], project: Project) -> None:
+    """Caches the Project as the version of the file at path, dropping old ones."""
+    with LOCK:
+        _CACHE.pop(path, None)
+        _CACHE[path] = (key, project)
+        while len(_CACHE) > MAX_PROJECTS:
+            del _CACHE[next(iter(_CACHE))]
+
+
+def open_project(path: str) -> Project:
+    """Returns a copy of the Project at path, only parsing the file if it changed.
+
+    Copies share their readings, so they're cheap to make.
+    """
+    path = os.path.abspath(path)
+    # if the file changes while it's read, this won't match the next time
+    key = version(path)
+    with LOCK:
+        cached = _CACHE.get(path)
+    if cached is not None and cached[0] == key:
+        LOGGER.debug("Copied %s from the project cache", path)
+        project = cached[1]
+    else:
+        project = Project()
+        project.load_json(path)
+    remember(path, key, project)
+    return project.copy()
+
+
+def save_project(project: Project) -> None:
+    """Saves the Project to its path, caching a copy as the file's latest version.
+
+    Copying makes tkVars, so this is for the main thread. Tests saved from the
+    readings thread are left for open_project to pick up.
+    """
+    path = os.path.abspath(project.path.get())
+    project.dump_json(path)
+    remember(path, version(path), project.copy())
@@ -0,0 +1,123 @@
+"""A single scheduler that times the acquisition for every system."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+from scalewiz.models.clock import Clock
+from scalewiz.models.pumps import make_clock
+
+if typing.TYPE_CHECKING:
+    from typing import Any, Callable
+
+LOGGER = logging.getLogger("scalewiz")
+
+_SHARED: Scheduler = None  # the scheduler shared by every system in the GUI
+
+
+class Timer:
+    """A handle to a callback scheduled to run at a deadline."""
+
+    def __init__(
+        self, deadline: float, seq: int, callback: Callable, args: tuple[Any]
+    ) -> None:
+        self.deadline = deadline
+        self.seq = seq  # breaks ties, so timers with equal deadlines run in order
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def __lt__(self, other: Timer) -> bool:
+        return (self.deadline, self.seq) < (other.deadline, other.seq)
+
+    def cancel(self) -> None:
+        """Cancels the callback if it hasn't run yet."""
+        self.cancelled = True
+
+
+class Scheduler:
+    """Runs callbacks at deadlines on a Clock.
+
+    One timing thread keeps a heap of every system's deadlines. Due callbacks are
+    handed to a shared worker pool, so a slow serial round trip on one system
+    can't hold up the others. Pump queries made within callbacks go to io_pool.
+
+    If workers is 0, callbacks run inline on the thread that calls run(),
+    which returns once there is nothing left to do. This is for headless use,
+    where the tkVars must only be touched from the main thread.
+    """
+
+    def __init__(self, clock: Clock = None, workers: int = 16) -> None:
+        self.clock = clock if clock is not None else Clock()
+        self.timers: list[Timer] = []  # a heap, soonest deadline first
+        self.condition = threading.Condition()
+        self.seq = itertools.count()
+        self.pool: ThreadPoolExecutor = None
+        if workers > 0:
+            self.pool = ThreadPoolExecutor(workers, thread_name_prefix="scheduler")
+        self.io_pool = ThreadPoolExecutor(32, thread_name_prefix="pump-io")
+        self.thread: threading.Thread = None
+
+    def call_at(self, deadline: float, callback: Callable, *args: Any) -> Timer:
+        """Schedules the callback to run at the passed clock time."""
+        timer = Timer(deadline, next(self.seq), callback, args)
+        with self.condition:
+            heapq.heappush(self.timers, timer)
+            self.condition.notify()
+        return timer
+
+    def call_later(self, delay: float, callback: Callable, *args: Any) -> Timer:
+        """Schedules the callback to run after delay clock seconds."""
+        return self.call_at(self.clock.monotonic() + delay, callback, *args)
+
+    def start(self) -> None:
+        """Starts the timing thread."""
+        self.thread = threading.Thread(target=self.run, name="scheduler", daemon=True)
+        self.thread.start()
+
+    def run(self) -> None:
+        """Dispatches callbacks as they come due."""
+        while True:
+            with self.condition:
+                while True:
+                    # cancelled timers are dropped lazily, once they reach the top
+                    while len(self.timers) > 0 and self.timers[0].cancelled:
+                        heapq.heappop(self.timers)
+                    if len(self.timers) == 0:
+                        if self.pool is None:  # running inline, so we're done
+                            return
+                        self.condition.wait()
+                        continue
+                    delay = self.timers[0].deadline - self.clock.monotonic()
+                    if delay <= 0:
+                        timer = heapq.heappop(self.timers)
+                        break
+                    self.condition.wait(delay / self.clock.speed)
+            if self.pool is None:
+                self.execute(timer)
+            else:
+                self.pool.submit(self.execute, timer)
+
+    def execute(self, timer: Timer) -> None:
+        """Runs the timer's callback, logging anything it raises."""
+        # pylint: disable=broad-except
+        if timer.cancelled:
+            return
+        try:
+            timer.callback(*timer.args)
+        except Exception:
+            LOGGER.exception("Scheduled call to %s failed", timer.callback)
+
+
+def get_scheduler() -> Scheduler:
+    """Returns the Scheduler shared by every system, starting it if needed."""
+    global _SHARED  # pylint: disable=global-statement
+    if _SHARED is None:
+        _SHARED = Scheduler(make_clock())
+        _SHARED.start()
+    return _SHARED
@@ -0,0 +1,291 @@
+"""Scores the Tests in a Project against its blanks."""
+
+from __future__ import annotations
+
+import typing
+from typing import NamedTuple
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    from typing import Optional, Union
+
+    from scalewiz.models.project import Project
+
+
+class Sample(NamedTuple):
+    """The data needed to score a Test."""
+
+    name: str
+    is_blank: bool
+    include: bool  # only blanks included on the report are scored against
+    pump: str  # which series of pressures is considered
+    pressures: np.ndarray
+    key: object = None  # what the pressures came from, eg. the Test's Readings
+
+
+class Step(NamedTuple):
+    """A step in a calculation, like 'name: formula', 'name: working', 'name: value'."""
+
+    name: str
+    value: Union[float, int, str]
+    formula: str = None
+    working: str = None
+    unit: str = ""
+
+
+class Trace(NamedTuple):
+    """A record of how the scores were calculated."""
+
+    project: list[Step]  # max readings and baseline area
+    blanks: list[tuple[str, list[Step]]]  # (name, steps) for each blank
+    protectable: list[Step]  # the average protectable area
+    trials: list[tuple[str, list[Step]]]  # (name, steps) for each trial
+
+
+class Scores(NamedTuple):
+    """The result of scoring some samples."""
+
+    results: list[Optional[float]]  # per sample, None for anything not scored
+    trace: Trace
+
+
+class ScoreCache:
+    """Remembers the parts of a score that didn't change since the last one.
+
+    Each sample's sums are kept per readings and pump, the blanks' average is
+    kept until a blank or the limits change, and each trial's result is kept
+    until its own inputs or the blanks' average change.
+    Entries not used by the latest score are dropped.
+    """
+
+    def __init__(self) -> None:
+        # the keys use id()s, so each maps to (what the key was made from, values)
+        # keeping those alive means their ids can't be reused while cached
+        self.sums: dict[tuple, tuple] = {}
+        self.blanks: dict[tuple, tuple] = {}
+        self.trials: dict[tuple, tuple] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cache: dict[tuple, tuple], key: tuple) -> Optional[tuple]:
+        """Returns the cached values for key, if there are any."""
+        entry = cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+
+def score(
+    samples: list[Sample],
+    limit_psi: int,
+    limit_minutes: float,
+    interval_seconds: float,
+    baseline: int,
+    cache: ScoreCache = None,
+) -> Scores:
+    """Scores each trial in samples against the average of the included blanks.
+
+    If there are no included blanks, nothing is scored.
+    Pass the same cache between calls to only recalculate what changed.
+    """
+    if cache is None:
+        cache = ScoreCache()
+    trace = Trace([], [], [], [])
+    results: list[Optional[float]] = [None] * len(samples)
+
+    max_readings = round(limit_minutes * 60 / interval_seconds)
+    trace.project.append(
+        Step("Max readings", max_readings, "limitMin * 60 / reading interval")
+    )
+    baseline_area = round(baseline * max_readings)
+    trace.project.append(
+        Step(
+            "Baseline area",
+            baseline_area,
+            "baseline PSI * max readings",
+            f"{baseline} * {max_readings}",
+        )
+    )
+
+    # sum up the pressures, only for samples we haven't seen before
+    sums = {}
+    owners = [sample.key if sample.key is not None else sample for sample in samples]
+    keys = [
+        (id(owner), sample.pump, len(sample.pressures))
+        for owner, sample in zip(owners, samples)
+    ]
+    for key, owner, sample in zip(keys, owners, samples):
+        cached = cache.get(cache.sums, key)
+        if cached is None:
+            cached = (len(sample.pressures), int(sample.pressures.sum()))
+        sums[key] = (owner, cached)
+    cache.sums = sums
+    counts = np.array([sums[key][1][0] for key in keys], dtype=np.int64)
+    integrals = np.array([sums[key][1][1] for key in keys], dtype=np.int64)
+
+    blanks = [i for i, s in enumerate(samples) if s.is_blank and s.include]
+    trials = [i for i, s in enumerate(samples) if not s.is_blank]
+
+    # the blanks' average only changes when a blank or the limits do
+    blanks_key = (tuple(keys[i] for i in blanks), limit_psi, max_readings)
+    blanks_owner = tuple(owners[i] for i in blanks)
+    cached = cache.get(cache.blanks, blanks_key)
+    if cached is None:
+        cached = score_blanks(
+            [samples[i] for i in blanks],
+            counts[blanks],
+            integrals[blanks],
+            limit_psi,
+            max_readings,
+        )
+    cache.blanks = {blanks_key: (blanks_owner, cached)}
+    blank_steps, protectable_steps, avg_protectable_area = cached
+    trace.blanks.extend(zip([samples[i].name for i in blanks], blank_steps))
+    if len(blanks) == 0:
+        return Scores(results, trace)
+    trace.protectable.extend(protectable_steps)
+
+    # only score the trials that changed
+    scored = {}
+    context = (limit_psi, max_readings, baseline_area, avg_protectable_area)
+    missing = []
+    for i in trials:
+        key = (*keys[i], *context)
+        cached = cache.get(cache.trials, key)
+        if cached is None:
+            missing.append(i)
+        else:
+            scored[key] = (owners[i], cached)
+
+    # a trial that stopped early is scored as if it sat at the limit afterwards
+    trial_integrals = integrals[missing] + (max_readings - counts[missing]) * limit_psi
+    raws = 1 - (trial_integrals - baseline_area) / avg_protectable_area
+    for i, int_psi, raw in zip(missing, trial_integrals, raws):
+        result = round(float(raw), 3)
+        steps = describe(samples[i])
+        steps.append(Step("Integral PSI", int(int_psi), "sum of all pressure readings"))
+        steps.append(
+            Step(
+                "Result",
+                result,
+                "1 - (integral PSI - baseline area) / avg protectable area",
+                f"1 - ({int_psi} - {baseline_area}) / {avg_protectable_area}",
+            )
+        )
+        scored[(*keys[i], *context)] = (owners[i], (result, steps))
+    cache.trials = scored
+
+    for i in trials:
+        result, steps = scored[(*keys[i], *context)][1]
+        results[i] = result
+        trace.trials.append((samples[i].name, steps))
+
+    return Scores(results, trace)
+
+
+def score_blanks(
+    blanks: list[Sample],
+    counts: np.ndarray,
+    integrals: np.ndarray,
+    limit_psi: int,
+    max_readings: int,
+) -> tuple[list[list[Step]], list[Step], Optional[int]]:
+    """Returns the steps for each blank, and for their average protectable area.
+
+    Also returns the average protectable area, or None if there are no blanks.
+    """
+    blank_steps = []
+    areas = limit_psi * counts - integrals
+    for blank, count, int_psi, area in zip(blanks, counts, integrals, areas):
+        steps = describe(blank)
+        steps.append(Step("Integral PSI", int(int_psi), "sum of all pressure readings"))
+        steps.append(
+            Step(
+                "Area over blank",
+                int(area),
+                "limit_psi * # of readings - integral PSI",
+                f"{limit_psi} * {count} - {int_psi}",
+            )
+        )
+        blank_steps.append(steps)
+
+    if len(blanks) == 0:
+        return blank_steps, [], None
+    avg_blank_area = round(int(areas.sum()) / len(blanks))
+    avg_protectable_area = limit_psi * max_readings - avg_blank_area
+    protectable_steps = [
+        Step("Avg. area over blanks", avg_blank_area),
+        Step(
+            "Avg. protectable area",
+            avg_protectable_area,
+            "limit_psi * max_readings - avg. area over blanks",
+            f"{limit_psi} * {max_readings} - {avg_blank_area}",
+        ),
+    ]
+    return blank_steps, protectable_steps, avg_protectable_area
+
+
+def describe(sample: Sample) -> list[Step]:
+    """Returns the steps describing the data a sample is scored on."""
+    pressures = sample.pressures
+    # the first few readings are taken as the baseline
+    observed_baseline = round(int(pressures[0:4].sum()) / 4)
+    return [
+        Step("Considering data", sample.pump),
+        Step("Total readings", len(pressures)),
+        Step("Observed baseline", observed_baseline, unit=" psi"),
+    ]
+
+
+def score_project(project: Project, cache: ScoreCache = None) -> Scores:
+    """Scores the Tests in a Project."""
+    samples = [
+        Sample(
+            test.name.get(),
+            test.is_blank.get(),
+            test.include_on_report.get(),
+            test.pump_to_score.get(),
+            test.get_readings(),
+            test.readings,
+        )
+        for test in project.tests
+    ]
+    return score(
+        samples,
+        project.limit_psi.get(),
+        project.limit_minutes.get(),
+        project.interval_seconds.get(),
+        project.baseline.get(),
+        cache,
+    )
+
+
+def format_trace(trace: Trace) -> list[str]:
+    """Returns the lines of a human-readable calculation log."""
+    lines = []
+
+    def add(steps: list[Step]) -> None:
+        for step in steps:
+            if step.formula is not None:
+                lines.append(f"{step.name}: {step.formula}")
+            if step.working is not None:
+                lines.append(f"{step.name}: {step.working}")
+            lines.append(f"{step.name}: {step.value}{step.unit}")
+
+    add(trace.project)
+    lines.extend(["-" * 80, ""])
+    for name, steps in trace.blanks:
+        lines.append(f"Evaluating {name}")
+        add(steps)
+        lines.append("")
+    if len(trace.protectable) > 0:
+        add(trace.protectable)
+        lines.extend(["-" * 80, ""])
+    for name, steps in trace.trials:
+        lines.append(f"Evaluating {name}")
+        add(steps)
+        lines.append("")
+    return lines
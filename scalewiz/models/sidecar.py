@@ -0,0 +1,79 @@
+"""A compact binary file for a Project's readings, kept beside its JSON file.
+
+The file starts with a fixed size header, followed by each Test's readings.
+A Test's readings are stored as its columns one after another, in the order of
+DTYPES, as little-endian 8 byte values. The project JSON records the offset and
+count of each Test's readings, so the file can be read a Test at a time, or
+memory-mapped as is.
+
+Saved readings never change, so the file is only ever appended to. Readings of
+Tests that were deleted stay behind until the project is exported without them.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+
+import numpy as np
+
+from scalewiz.models.readings import DTYPES, Readings
+
+LOGGER = logging.getLogger("scalewiz")
+
+EXT = ".readings"
+MAGIC = b"ScaleWiz readings v1\n".ljust(32, b"\0")  # keeps the columns 8 byte aligned
+# the same columns, with an explicit byte order so files can be shared
+FILE_DTYPES = {key: np.dtype(dtype).newbyteorder("<") for key, dtype in DTYPES.items()}
+WIDTH = sum(dtype.itemsize for dtype in FILE_DTYPES.values())  # bytes per reading
+LOCK = threading.Lock()  # tests on different systems may be saved at once
+
+
+def sidecar_path(project_path: str) -> str:
+    """Returns the path of the readings file for the project at the passed path."""
+    return f"{os.path.splitext(os.path.abspath(project_path))[0]}{EXT}"
+
+
+def read_readings(path: str, offset: int, count: int) -> Readings:
+    """Returns the count readings stored at offset in the file at path."""
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} isn't a readings file")
+        file.seek(offset)
+        data = file.read(count * WIDTH)
+    if len(data) != count * WIDTH:
+        raise ValueError(f"{path} is missing readings at offset {offset}")
+    readings = Readings()
+    position = 0
+    for key, dtype in FILE_DTYPES.items():
+        # read-only views into the data, saved readings aren't mutated
+        column = np.frombuffer(data, dtype, count, position)
+        readings.columns[key] = column.astype(DTYPES[key], copy=False)
+        position += count * dtype.itemsize
+    readings.count = count
+    return readings
+
+
+def append_readings(path: str, batch: list[Readings]) -> list[int]:
+    """Appends each of the Readings in batch to the file at path.
+
+    Makes the file if it doesn't exist. Returns the offset of each.
+    """
+    offsets = []
+    with LOCK:
+        if os.path.isfile(path):  # don't append to something else by mistake
+            with open(path, "rb") as file:
+                if file.read(len(MAGIC)) not in (MAGIC, b""):
+                    raise ValueError(f"{path} isn't a readings file")
+        with open(path, "ab") as file:
+            if file.tell() == 0:
+                file.write(MAGIC)
+                LOGGER.info("Started a readings file at %s", path)
+            for readings in batch:
+                offsets.append(file.tell())
+                for key, dtype in FILE_DTYPES.items():
+                    file.write(readings[key].astype(dtype, copy=False).tobytes())
+            file.flush()
+            os.fsync(file.fileno())
+    return offsets
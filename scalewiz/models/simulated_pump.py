@@ -0,0 +1,138 @@
+"""A stand-in for a NextGenPump that simulates a scaling test without hardware."""
+
+from __future__ import annotations
+
+import logging
+import math
+import random
+import typing
+from typing import Union
+
+from py_hplc.pump_error import PumpError
+
+from scalewiz.models.clock import Clock
+
+if typing.TYPE_CHECKING:
+    from logging import Logger
+
+
+class SimulatedSerial:
+    """Stands in for the pump's serial port."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.is_open = True
+
+    def close(self) -> None:
+        self.is_open = False
+
+
+class SimulatedPump:
+    """Quacks like a py_hplc NextGenPump, but simulates its pressure.
+
+    Pressure holds near baseline_psi until onset_minutes after the pump starts,
+    then climbs by rise_psi * (e^(t / tau_minutes) - 1) as the capillary scales
+    up, until it reaches max_pressure.
+    Every command takes latency_ms (plus or minus jitter_ms) to answer, and fails
+    with a PumpError at the given failure_rate. Time is told by the passed clock.
+    """
+
+    # pylint: disable=too-many-instance-attributes, too-many-arguments
+
+    def __init__(
+        self,
+        device: str,
+        logger: Logger = None,
+        baseline_psi: int = 75,
+        onset_minutes: float = 10.0,
+        tau_minutes: float = 3.0,
+        rise_psi: float = 20.0,
+        noise_psi: float = 2.0,
+        latency_ms: float = 30.0,
+        jitter_ms: float = 10.0,
+        failure_rate: float = 0.0,
+        seed: int = None,
+        clock: Clock = None,
+    ) -> None:
+        if logger is None:
+            self.logger = logging.getLogger(f"{logging.getLogger().name}.{device}")
+        else:
+            self.logger = logging.getLogger(f"{logger.name}.{device}")
+        self.serial = SimulatedSerial(device)
+        self.clock = clock if clock is not None else Clock()
+        self.random = random.Random(seed)
+        self.baseline_psi = baseline_psi
+        # no two capillaries scale at exactly the same time
+        self.onset_minutes = onset_minutes * self.random.uniform(0.9, 1.1)
+        self.tau_minutes = tau_minutes
+        self.rise_psi = rise_psi
+        self.noise_psi = noise_psi
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        # mimic the attributes a NextGenPump reads when it identifies itself
+        self.max_pressure = 6000.0
+        self.max_flowrate = 10.0
+        self.pressure_units = "psi"
+        self.version = "simulated"
+        self._flowrate = 0.0
+        self.started: float = None  # monotonic time the pump was last run
+        self.logger.info("Simulated serial port connected")
+
+    def command(self, command: str) -> None:
+        """Simulates the round trip of a command over serial."""
+        delay = self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)
+        self.clock.sleep(delay / 1000)
+        if self.random.random() < self.failure_rate:
+            raise PumpError(
+                command=command,
+                response="",
+                message=f"Simulated failure in response to a command: '{command}'",
+                port=self.serial.name,
+            )
+        self.logger.debug("Simulated %s", command)
+
+    def run(self) -> None:
+        """Runs the pump."""
+        self.command("ru")
+        if self.started is None:
+            self.started = self.clock.monotonic()
+
+    def stop(self) -> None:
+        """Stops the pump."""
+        self.command("st")
+        self.started = None
+
+    def close(self) -> None:
+        """Closes the simulated serial port."""
+        self.serial.close()
+        self.logger.info("Simulated serial port closed")
+
+    @property
+    def is_open(self) -> bool:
+        """Returns a boolean representing if the simulated port is open."""
+        return self.serial.is_open
+
+    @property
+    def flowrate(self) -> float:
+        """Gets/sets the flowrate of the pump as a float in mililiters per minute."""
+        self.command("cc")
+        return self._flowrate
+
+    @flowrate.setter
+    def flowrate(self, flowrate: float) -> None:
+        self.command("fi")
+        self._flowrate = min(flowrate, self.max_flowrate)
+
+    @property
+    def pressure(self) -> Union[float, int]:
+        """Gets the pump's current simulated pressure in psi."""
+        self.command("pr")
+        psi = self.baseline_psi + self.random.gauss(0, self.noise_psi)
+        if self.started is not None:
+            minutes = (self.clock.monotonic() - self.started) / 60
+            if minutes > self.onset_minutes:
+                scaled = (minutes - self.onset_minutes) / self.tau_minutes
+                # clamp the exponent, we'd be way past max_pressure anyways
+                psi += self.rise_psi * math.expm1(min(scaled, 50))
+        return int(max(min(psi, self.max_pressure), 0))
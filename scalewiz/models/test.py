@@ -3,9 +3,16 @@
 from __future__ import annotations
 
 # util
+import json
 import logging
 import tkinter as tk
-from typing import Any, Union
+from typing import Union
+
+import numpy as np
+
+from scalewiz.helpers.project_file import INDENT
+from scalewiz.models.readings import Readings
+from scalewiz.models.sidecar import read_readings
 
 LOGGER = logging.getLogger("scalewiz")
 
@@ -26,7 +33,13 @@ class Test:
         self.pump_to_score = tk.StringVar()  # which series of PSIs to use
         self.result = tk.DoubleVar()  # represents the test's performance vs the blank
         self.include_on_report = tk.BooleanVar()  # condition for scoring
-        self.readings: list[dict] = []  # list of flat reading dicts
+        self._readings = Readings()  # columns of pressure readings, None until loaded
+        # readings loaded from file are kept as-is until they're first needed,
+        # either as their JSON text or as parsed
+        self.raw_readings: Union[str, list[dict[str, Union[float, int]]]] = None
+        self.stored_at: tuple[str, int, int] = None  # readings file, offset, count
+        self.readings_version = 0  # bumped whenever the readings are replaced
+        self.serialized: tuple[tuple, str] = None  # (state, text) from the last save
         self.max_psi = tk.IntVar()  # the highest psi of the test
         self.observed_baseline = tk.IntVar()  # a guess at the baseline for the test
         # set defaults
@@ -41,8 +54,65 @@ class Test:
         self.name.trace_add("write", self.update_label)
         self.pump_to_score.trace_add("write", self.update_obs_baseline)
 
-    def to_dict(self) -> dict[str, Union[bool, float, int, str]]:
-        """Returns a dict representation of a Test."""
+    @property
+    def readings(self) -> Readings:
+        """The Test's readings, loaded from file on first access."""
+        if self._readings is None:
+            if self.stored_at is not None:
+                self._readings = read_readings(*self.stored_at)
+            elif isinstance(self.raw_readings, str):
+                self._readings = Readings.from_list(json.loads(self.raw_readings))
+            else:
+                self._readings = Readings.from_list(self.raw_readings)
+            self.raw_readings = None
+            self.update_obs_baseline()
+        return self._readings
+
+    @readings.setter
+    def readings(self, readings: Readings) -> None:
+        self._readings = readings
+        self.raw_readings = None
+        self.stored_at = None
+        self.readings_version += 1
+
+    def to_dict(self, sidecar: str = None) -> dict[str, Union[bool, float, int, str]]:
+        """Returns a dict representation of a Test.
+
+        If the readings are stored in the readings file at sidecar, only where
+        they are is included.
+        """
+        if sidecar is not None and self.stored_at is not None:
+            if self.stored_at[0] == sidecar:
+                _, offset, count = self.stored_at
+                return {
+                    **self.metadata(),
+                    "readings": {"offset": offset, "count": count},
+                }
+        if self.raw_readings is not None:  # no need to load them just to save them
+            raw = self.raw_readings
+            if isinstance(raw, str):
+                raw = json.loads(raw)
+            return {**self.metadata(), "readings": raw}
+        return {**self.metadata(), "readings": self.readings.to_list()}
+
+    def to_json(self, sidecar: str = None) -> str:
+        """Returns the Test as JSON, indented to sit in a project file.
+
+        The text is kept, and reused until the Test changes.
+        """
+        state = self.json_state(sidecar)
+        if self.serialized is None or self.serialized[0] != state:
+            text = json.dumps(self.to_dict(sidecar), indent=4)
+            self.serialized = (state, text.replace("\n", f"\n{INDENT}"))
+        return self.serialized[1]
+
+    def json_state(self, sidecar: str = None) -> tuple:
+        """Returns everything that to_dict's output depends on."""
+        # saved readings aren't mutated, only replaced
+        return (self.metadata(), sidecar, self.stored_at, self.readings_version)
+
+    def metadata(self) -> dict[str, Union[bool, float, int, str]]:
+        """Returns a dict representation of a Test, without its readings."""
         return {
             "name": self.name.get(),
             "isBlank": self.is_blank.get(),
@@ -55,11 +125,29 @@ class Test:
             "includeOnRep": self.include_on_report.get(),
             "result": self.result.get(),
             "obsBaseline": self.observed_baseline.get(),
-            "readings": self.readings,
         }
 
-    def load_json(self, obj: dict[str, Union[bool, float, int, str]]) -> None:
-        """Load a Test with values from a JSON object."""
+    def copy(self) -> Test:
+        """Returns a copy of the Test. Saved readings aren't mutated, so are shared."""
+        test = Test()
+        test.load_json(self.metadata())
+        # if they aren't loaded yet, let the copy load them if it needs to
+        test.raw_readings, test.stored_at = self.raw_readings, self.stored_at
+        test._readings = self._readings  # pylint: disable=protected-access
+        test.readings_version, test.serialized = self.readings_version, self.serialized
+        if self._readings is not None:
+            test.update_obs_baseline()
+        return test
+
+    def load_json(
+        self, obj: dict[str, Union[bool, float, int, str]], sidecar: str = None
+    ) -> None:
+        """Load a Test with values from a JSON object.
+
+        If the object only says where its readings are, they're read from the
+        readings file at sidecar.
+        """
+        self.readings = Readings()
         self.name.set(obj.get("name"))
         self.is_blank.set(obj.get("isBlank"))
         self.chemical.set(obj.get("chemical"))
@@ -70,13 +158,18 @@ class Test:
         self.pump_to_score.set(obj.get("toConsider"))
         self.include_on_report.set(obj.get("includeOnRep"))
         self.result.set(obj.get("result"))
-        self.readings = obj.get("readings")
-        self.update_obs_baseline()
-
-    def get_readings(self) -> list[int]:
-        """Returns a list of the pump_to_score's pressure readings."""
-        pump = self.pump_to_score.get()
-        return [reading[pump] for reading in self.readings]
+        # until the readings are loaded, go by the saved baseline
+        self.observed_baseline.set(obj.get("obsBaseline", 0))
+        readings = obj.get("readings")
+        if isinstance(readings, dict):
+            self.stored_at = (sidecar, readings["offset"], readings["count"])
+        else:
+            self.raw_readings = readings
+        self._readings = None
+
+    def get_readings(self) -> np.ndarray:
+        """Returns a view of the pump_to_score's pressure readings."""
+        return self.readings[self.pump_to_score.get()]
 
     def update_test_name(self, *args) -> None:
         """Makes a name by concatenating the chemical name and rate."""
@@ -97,9 +190,9 @@ class Test:
         """Sets the observed baseline psi."""
         if len(self.readings) > 0:
             pressures = self.get_readings()
-            self.max_psi.set(max(pressures))
+            self.max_psi.set(int(pressures.max()))
             baselines = pressures[0:4]
-            self.observed_baseline.set(round(sum(baselines) / 4))
+            self.observed_baseline.set(round(int(baselines.sum()) / 4))
 
     def remove_traces(self) -> None:
         """Remove tkVar traces to allow the GC to do its thing."""
@@ -6,22 +6,30 @@ import logging
 import os
 import tkinter as tk
 import typing
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
 from datetime import date
 from queue import Queue
-from threading import Event
-from time import monotonic, sleep, time
+from threading import Event, RLock
+from time import time
 from tkinter import filedialog, messagebox
 
 from py_hplc import NextGenPump
+from py_hplc.pump_error import PumpError
+from serial import SerialException
 
+from scalewiz.helpers.configuration import get_config
+from scalewiz.models.journal import Journal, find_journals, replay
 from scalewiz.models.project import Project
+from scalewiz.models.pumps import SIM_PREFIX, make_pump
+from scalewiz.models.readings import Readings
+from scalewiz.models.repository import open_project, save_project
+from scalewiz.models.scheduler import Scheduler, Timer, get_scheduler
 from scalewiz.models.test import Test
 
 if typing.TYPE_CHECKING:
     from tkinter import ttk
     from tkinter.scrolledtext import ScrolledText
-    from typing import List
+    from typing import Callable, List
 
     from scalewiz.components.test_handler_view import TestHandlerView
 
@@ -31,18 +39,35 @@ class TestHandler:
 
     # pylint: disable=too-many-instance-attributes
 
-    def __init__(self, name: str = "Nemo") -> None:
+    def __init__(self, name: str = "Nemo", scheduler: Scheduler = None) -> None:
         self.name = name
+        # times the uptake and readings, shared with the other systems by default
+        self.scheduler = scheduler if scheduler is not None else get_scheduler()
+        # tells time for the readings loop, and may fast-forward simulated tests
+        self.clock = self.scheduler.clock
+        self.timer: Timer = None  # the next scheduled step of the test
+        self.watchdog: Timer = None  # the next scheduled pressure-limit check
+        self.watchdog_start: float = None  # clock time the watchdog was started
+        # held while a step runs, so a stop never lands halfway through one
+        self.step_lock = RLock()
+        self.finished = False  # set once the test has been stopped and saved
+        self.stop_requested_at: float = None  # clock time of the last stop request
+        self.stop_latency_ms: float = None  # time from stop request to pumps stopped
+        self.overshoot_psi: int = None  # how far past the limit the test stopped
+        self.uptake_start: float = None  # clock time the pumps were started
+        self.test_start: float = None  # clock time the readings were started
         self.logger = logging.getLogger(f"scalewiz.{name}")
         self.view: TestHandlerView = None
         self.project = Project()
         self.test: Test = None
-        self.pool = ThreadPoolExecutor(max_workers=1)
-        self.readings: Queue[dict] = Queue()
+        self.readings = Readings()  # preallocated in new_test
+        self.journal: Journal = None  # streams readings to disk as they come in
         self.editors: list[tk.Widget] = []  # list of views displaying the project
         self.max_readings: int = None  # max # of readings to collect
         self.max_psi_1: int = None
         self.max_psi_2: int = None
+        self.poll_times: tuple[float, float] = None  # when each pump was last read
+        self.max_skew_ms: float = None  # worst time skew between paired readings
         self.log_handler: logging.FileHandler = None  # handles logging to log window
         # test handler view overwrites this attribute in the view's build()
         self.log_text: ScrolledText = None
@@ -71,7 +96,7 @@ class TestHandler:
                 or self.max_psi_2 <= self.project.limit_psi.get()
             )
             and self.elapsed_min.get() <= self.project.limit_minutes.get()
-            and len(self.readings.queue) < self.max_readings
+            and len(self.readings) < self.max_readings
             and not self.stop_requested.is_set()
         )
 
@@ -100,10 +125,37 @@ class TestHandler:
                 self.logger.warning(msg)
                 messagebox.showwarning("Project already loaded", msg)
             else:
-                self.project = Project()
-                self.project.load_json(path)
+                self.project = open_project(path)
                 self.rebuild_views()
                 self.logger.info("Loaded %s", self.project.name.get())
+                self.recover_tests()
+
+    def recover_tests(
+        self, confirm: Callable[[str, str], bool] = messagebox.askyesno
+    ) -> None:
+        """Offers to recover Tests from journals left behind by an interrupted run.
+
+        The confirm callable is passed a title and message, like a messagebox.
+        """
+        for path in find_journals(self.project.path.get()):
+            test = replay(path)
+            if len(test.readings) == 0:
+                os.remove(path)
+                continue
+            msg = (
+                f"Found {len(test.readings)} unsaved readings for {test.name.get()}"
+                " from a test that didn't finish.\n"
+                f"Do you want to recover them into {self.project.name.get()}?"
+            )
+            if confirm("Recover test", msg):
+                self.project.tests.append(test)
+                save_project(self.project)
+                os.remove(path)
+                self.logger.info("Recovered %s from %s", test.name.get(), path)
+                self.update_editors(test)
+            else:  # keep the file around, but don't ask about it again
+                os.rename(path, f"{path}.discarded")
+                self.logger.info("Discarded the journal at %s", path)
 
     def start_test(self) -> None:
         """Perform a series of checks to make sure the test can run, then start it."""
@@ -111,6 +163,19 @@ class TestHandler:
         if self.is_running.get():
             return
 
+        issues = self.check_test()
+        if len(issues) > 0:
+            messagebox.showwarning("Couldn't start the test", "\n".join(issues))
+            for pump in (self.pump1, self.pump2):
+                if pump is not None:
+                    pump.close()
+        else:
+            self.begin_test()
+            self.logger.info("submitting")
+            self.timer = self.scheduler.call_later(0, self.step, self.take_readings)
+
+    def check_test(self) -> list[str]:
+        """Sets up the pumps, returning a list of any issues that prevent a test."""
         issues = []
         if not os.path.isfile(self.project.path.get()):
             msg = "Select an existing project file first"
@@ -126,87 +191,209 @@ class TestHandler:
 
         # this method will append issue msgs if any occur
         self.setup_pumps(issues)  # hooray for pointers
-        if len(issues) > 0:
-            messagebox.showwarning("Couldn't start the test", "\n".join(issues))
-            for pump in (self.pump1, self.pump2):
-                pump.close()
-        else:
-            self.stop_requested.clear()
-            self.is_done.set(False)
-            self.is_running.set(True)
-            self.update_log_handler()
-            self.logger.info("submitting")
-            self.pool.submit(self.take_readings)
+        return issues
+
+    def begin_test(self) -> None:
+        """Marks the test as running and opens its log file and journal."""
+        self.stop_requested.clear()
+        self.stop_requested_at = None
+        self.stop_latency_ms = None
+        self.overshoot_psi = None
+        self.finished = False
+        self.is_done.set(False)
+        self.is_running.set(True)
+        self.update_log_handler()
+        self.journal = Journal.start(self.project.path.get(), self.test)
 
     def take_readings(self) -> None:
-        """Get ready to take readings, then start doing it on a second thread."""
-        # run the uptake cycle ---------------------------------------------------------
-        uptake = self.project.uptake_seconds.get()
-        step = uptake / 100  # we will sleep for 100 steps
+        """Starts the pumps, then schedules the uptake cycle and readings."""
         self.pump1.run()
         self.pump2.run()
-        rinse_start = monotonic()
-        sleep(step)
-        for i in range(100):
-            elapsed = monotonic() - rinse_start
-            if self.can_run():
-                self.elapsed_str.set(f"{uptake - elapsed:.1f} s")
-                self.progress.set(i)
-                sleep(step - ((monotonic() - rinse_start) % step))
-            else:
-                self.stop_test()
-                break
-        self.log_queue.put("")  # add newline for clarity
-        # we use these in the loop
-        interval = self.project.interval_seconds.get()
-        test_start_time = monotonic()
-        sleep(interval)
-        # readings loop ----------------------------------------------------------------
-        while self.can_run():
-            minutes_elapsed = round((monotonic() - test_start_time) / 60, 2)
-
-            psi1 = self.pump1.pressure
-            psi2 = self.pump2.pressure
-            average = round(((psi1 + psi2) / 2))
-            reading = {
-                "elapsedMin": minutes_elapsed,
-                "pump 1": psi1,
-                "pump 2": psi2,
-                "average": average,
-            }
-
-            # make a message for the log in the test handler view
-            msg = "@ {:.2f} min; pump1: {}, pump2: {}, avg: {}".format(
-                minutes_elapsed, psi1, psi2, average
+        self.uptake_start = self.clock.monotonic()
+        step = self.project.uptake_seconds.get() / 100  # we will wait for 100 steps
+        self.timer = self.scheduler.call_at(
+            self.uptake_start + step, self.step, self.uptake_tick, 0
+        )
+        settings = get_config().get("watchdog", {})
+        if settings.get("enabled", True):
+            self.watchdog_start = self.uptake_start
+            self.schedule_watchdog(settings.get("interval", 0.25))
+
+    def step(self, callback: Callable, *args) -> None:
+        """Runs a scheduled step of the test, unless the test has finished."""
+        with self.step_lock:
+            if not self.finished:
+                callback(*args)
+
+    # each tick schedules the next one, at a deadline on a fixed grid of steps
+    # so that any time spent in a tick doesn't add up as drift
+    def uptake_tick(self, i: int) -> None:
+        """Updates the uptake cycle's progress, then schedules the next step."""
+        if not self.can_run():
+            self.finish_test()
+            return
+        uptake = self.project.uptake_seconds.get()
+        step = uptake / 100
+        elapsed = self.clock.monotonic() - self.uptake_start
+        if i < 100:
+            self.elapsed_str.set(f"{uptake - elapsed:.1f} s")
+            self.progress.set(i)
+            deadline = self.uptake_start + (i + 2) * step
+            self.timer = self.scheduler.call_at(
+                deadline, self.step, self.uptake_tick, i + 1
+            )
+        else:  # uptake is done, start the readings
+            self.log_queue.put("")  # add newline for clarity
+            self.test_start = self.clock.monotonic()
+            interval = self.project.interval_seconds.get()
+            self.timer = self.scheduler.call_at(
+                self.test_start + interval, self.step, self.reading_tick
             )
-            self.log_queue.put(msg)
-            self.logger.info(msg)
 
-            self.readings.put(reading)
-            self.elapsed_min.set(minutes_elapsed)
-            self.elapsed_str.set(f"{minutes_elapsed:.2f} min.")
-            self.progress.set(round(len(self.readings.queue) / self.max_readings * 100))
+    def reading_tick(self) -> None:
+        """Takes a reading, then schedules the next one."""
+        if not self.can_run():
+            self.finish_test()
+            return
+        try:
+            psi1, psi2, skew_ms = self.read_pressures()
+        except PumpError as err:  # try again next time
+            self.logger.warning("Failed to read the pumps: %s", err)
+        else:
+            self.record(psi1, psi2, skew_ms)
+            if self.over_limit():  # don't wait for the next tick to notice
+                self.limit_stop(psi1, psi2)
+                return
+        # skip any readings we are already too late for
+        # TYSM https://stackoverflow.com/a/25251804
+        interval = self.project.interval_seconds.get()
+        now = self.clock.monotonic()
+        deadline = now + interval - ((now - self.test_start) % interval)
+        self.timer = self.scheduler.call_at(deadline, self.step, self.reading_tick)
+
+    def record(self, psi1: int, psi2: int, skew_ms: float) -> None:
+        """Records a pair of pressure readings."""
+        # stamp the reading halfway between the two pumps' sample times
+        sampled = sum(self.poll_times) / 2
+        minutes_elapsed = round((sampled - self.test_start) / 60, 2)
+        average = round(((psi1 + psi2) / 2))
+
+        # make a message for the log in the test handler view
+        msg = "@ {:.2f} min; pump1: {}, pump2: {}, avg: {}".format(
+            minutes_elapsed, psi1, psi2, average
+        )
+        self.log_queue.put(msg)
+        self.logger.info(msg)
+        self.logger.debug("pump skew: %.1f ms", skew_ms)
+
+        self.readings.append(minutes_elapsed, psi1, psi2, average)
+        self.journal.append(minutes_elapsed, psi1, psi2, average)
+        self.elapsed_min.set(minutes_elapsed)
+        self.elapsed_str.set(f"{minutes_elapsed:.2f} min.")
+        self.progress.set(round(len(self.readings) / self.max_readings * 100))
+
+        if psi1 > self.max_psi_1:
+            self.max_psi_1 = psi1
+        if psi2 > self.max_psi_2:
+            self.max_psi_2 = psi2
+        if skew_ms > self.max_skew_ms:
+            self.max_skew_ms = skew_ms
+
+    # the watchdog checks the pressure limit more often than readings are logged
+    # it runs as a step too, so it never talks to the pumps at the same time
+    def schedule_watchdog(self, interval: float) -> None:
+        """Schedules the next pressure-limit check."""
+        now = self.clock.monotonic()
+        deadline = now + interval - ((now - self.watchdog_start) % interval)
+        self.watchdog = self.scheduler.call_at(
+            deadline, self.step, self.watchdog_tick, interval
+        )
 
+    def watchdog_tick(self, interval: float) -> None:
+        """Stops the test as soon as both pumps are over the pressure limit."""
+        try:
+            psi1, psi2, _ = self.read_pressures()
+        except PumpError as err:  # the readings will report persistent failures
+            self.logger.debug("Watchdog failed to read the pumps: %s", err)
+        else:
             if psi1 > self.max_psi_1:
                 self.max_psi_1 = psi1
             if psi2 > self.max_psi_2:
                 self.max_psi_2 = psi2
-
-            # TYSM https://stackoverflow.com/a/25251804
-            sleep(interval - ((monotonic() - test_start_time) % interval))
-        # end of readings loop ---------------------------------------------------------
+            if self.over_limit():
+                self.limit_stop(psi1, psi2)
+                return
+        self.schedule_watchdog(interval)
+
+    def over_limit(self) -> bool:
+        """Returns True if both pumps have gone over the pressure limit."""
+        limit = self.project.limit_psi.get()
+        return self.max_psi_1 > limit and self.max_psi_2 > limit
+
+    def limit_stop(self, psi1: int, psi2: int) -> None:
+        """Stops the test for going over the pressure limit, noting the overshoot."""
+        self.stop_requested_at = self.clock.monotonic()
+        self.overshoot_psi = max(psi1, psi2) - self.project.limit_psi.get()
+        self.logger.info(
+            "Over the pressure limit (pump1: %s, pump2: %s, overshoot: %s psi)",
+            psi1,
+            psi2,
+            self.overshoot_psi,
+        )
+        self.finish_test()
+
+    def finish_test(self) -> None:
+        """Stops and saves the test."""
+        with self.step_lock:
+            if self.finished:  # eg. a stop request beat the next tick here
+                return
+            self.finished = True
+        for timer in (self.timer, self.watchdog):
+            if timer is not None:
+                timer.cancel()
+        self.timer = None
+        self.watchdog = None
+        self.logger.info("Max skew between pump readings: %.1f ms", self.max_skew_ms)
         self.stop_test()
         self.save_test()
 
-    # because the readings loop is blocking, it is handled on a separate thread
-    # beacuse of this, we have to interact with it in a somewhat backhanded way
+    def read_pressures(self) -> tuple[int, int, float]:
+        """Queries both pumps for their pressure at the same time.
+
+        Stores the time each pump was sampled in poll_times.
+        Returns the pressure for each pump and the skew between them in ms.
+        """
+
+        def query(pump: NextGenPump) -> tuple[int, float]:
+            sent = self.clock.monotonic()
+            psi = pump.pressure
+            # assume the pump sampled halfway through the round trip
+            return psi, (sent + self.clock.monotonic()) / 2
+
+        future1 = self.scheduler.io_pool.submit(query, self.pump1)
+        future2 = self.scheduler.io_pool.submit(query, self.pump2)
+        # let both round trips finish, even if one fails, so a retry can't send
+        # a second command down a port that's still busy with the first
+        wait([future1, future2])
+        psi1, time1 = future1.result()
+        psi2, time2 = future2.result()
+        self.poll_times = (time1, time2)
+        return psi1, psi2, abs(time1 - time2) * 1000
+
+    # the readings are taken on the scheduler's threads
+    # beacuse of this, we have to interact with them in a somewhat backhanded way
     # this method is intended to be called from the test handler view
     def request_stop(self) -> None:
         """Requests that the Test stop."""
-        if self.is_running.get():
-            # the readings loop thread checks this flag on each iteration
+        if self.is_running.get() and not self.stop_requested.is_set():
+            # the scheduled steps check this flag each time they run
             self.stop_requested.set()
+            self.stop_requested_at = self.clock.monotonic()
             self.logger.info("Received a stop request")
+            # don't wait out the rest of the interval for the next step
+            if self.timer is not None:
+                self.timer.cancel()
+            self.scheduler.call_later(0, self.finish_test)
 
     def stop_test(self) -> None:
         """Stops the pumps, closes their ports."""
@@ -219,18 +406,29 @@ class TestHandler:
                     pump.serial.name,
                 )
 
+        if self.stop_requested_at is not None:
+            self.stop_latency_ms = (
+                self.clock.monotonic() - self.stop_requested_at
+            ) * 1000
+            self.logger.info(
+                "Stopped the pumps %.1f ms after the stop request",
+                self.stop_latency_ms,
+            )
         self.is_done.set(True)
         self.logger.info("Test for %s has been stopped", self.test.name.get())
 
     def save_test(self) -> None:
         """Saves the test to the Project file in JSON format."""
-        for reading in list(self.readings.queue):
-            self.test.readings.append(reading)
+        self.test.readings = self.readings.copy()
+        self.test.update_obs_baseline()
+        # commit to the live project rather than reloading it from file
         self.project.tests.append(self.test)
         self.project.dump_json()
-        # refresh data / UI
-        self.load_project(path=self.project.path.get())
-        self.rebuild_views()
+        # the test is safely in the project file now
+        self.journal.close(remove=True)
+        # we are on the readings thread, so hand the UI update to the main thread
+        if self.view is not None:
+            self.view.after(0, self.update_editors, self.test)
 
     def setup_pumps(self, issues: List[str] = None) -> None:
         """Set up the pumps with some default values.
@@ -245,27 +443,42 @@ class TestHandler:
         if self.dev2.get() in ("", "None found"):
             issues.append("Select a port for pump 2")
 
+        if self.clock.speed != 1 and not all(
+            dev.get().startswith(SIM_PREFIX) for dev in (self.dev1, self.dev2)
+        ):
+            issues.append("Only simulated pumps can be run fast-forwarded")
+
         if self.dev1.get() == self.dev2.get():
             issues.append("Select two unique ports")
         else:
-            self.pump1 = NextGenPump(self.dev1.get(), self.logger)
-            self.pump2 = NextGenPump(self.dev2.get(), self.logger)
+            self.pump1 = self.open_pump(self.dev1.get(), issues)
+            self.pump2 = self.open_pump(self.dev2.get(), issues)
 
         for pump in (self.pump1, self.pump2):
-            if pump is None or not pump.is_open:
+            if pump is None:  # we already noted the issue
+                continue
+            if not pump.is_open:
                 issues.append(f"Couldn't connect to {pump.serial.name}")
                 continue
             pump.flowrate = self.project.flowrate.get()
             self.logger.info("set flowrate to %s", pump.flowrate)
 
+    def open_pump(self, device: str, issues: List[str]) -> NextGenPump:
+        """Returns a pump connected at the passed port, or None if it failed."""
+        try:
+            return make_pump(device, self.logger, self.clock)
+        except (SerialException, PumpError) as err:
+            self.logger.error("Couldn't connect to %s: %s", device, err)
+            issues.append(f"Couldn't connect to {device}")
+            return None
+
     # logging stuff / methods that affect UI
     def new_test(self) -> None:
         """Initialize a new test."""
         self.logger.info("Initialized a new test")
         self.test = Test()
-        with self.readings.mutex:
-            self.readings.queue.clear()
         self.max_psi_1 = self.max_psi_2 = 0
+        self.max_skew_ms = 0.0
         self.is_running.set(False)
         self.is_done.set(False)
         self.progress.set(0)
@@ -273,6 +486,7 @@ class TestHandler:
         self.max_readings = round(
             self.project.limit_minutes.get() * 60 / self.project.interval_seconds.get()
         )
+        self.readings.clear(self.max_readings)
 
         # rebuild the TestHandlerView
         if self.view is not None:
@@ -286,9 +500,19 @@ class TestHandler:
                 widget.build(reload=True)
             else:  # clean up as we go
                 self.editors.remove(widget)
-        self.view.build()
+        if self.view is not None:
+            self.view.build()
         self.logger.info("Rebuilt all view widgets")
 
+    def update_editors(self, test: Test) -> None:
+        """Adds a newly saved Test to all open editors without reloading them."""
+        for widget in self.editors.copy():
+            if widget.winfo_exists():
+                self.logger.debug("Adding %s to %s", test.name.get(), widget)
+                widget.add_test(test)
+            else:  # clean up as we go
+                self.editors.remove(widget)
+
     def update_log_handler(self) -> None:
         """Sets up the logging FileHandler to the passed path."""
         log_file = f"{round(time())}_{self.test.name.get()}_{date.today()}.txt"